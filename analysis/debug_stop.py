@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 
 import matplotlib
+matplotlib.use("Agg")  # plots are only saved to files (plt.show() is disabled below)
 import matplotlib.pyplot as plt
 
 plt.rcParams["font.family"] = "AppleGothic"   # macOS 한글 폰트
@@ -15,7 +16,6 @@ sys.path.insert(0, str(ROOT))
 
 from analysis.stops import analyze_stop, F0Calibration
 
-import math
 import numpy as np
 
 def phonation_to_syllable_labels(place: str) -> dict:
@@ -51,30 +51,6 @@ def classify_by_reference_ellipse(x, y, vot_ranges, f0z_targets):
             best_phon = phon
     return best_phon, best_d
 
-def x_from_place_softscores(place_softscores: dict, temp: float = 12.0) -> float:
-    """
-    place_softscores (0~100 같은 점수) -> 1D axis x position (0~3)
-    - labial center: 0.5
-    - alveolar center: 1.5
-    - velar center: 2.5
-
-    temp: 클수록(예: 20) 더 '부드럽게' 평균, 작을수록(예: 5) 더 '승자독식'에 가까움
-    """
-    centers = {"labial": 0.5, "alveolar": 1.5, "velar": 2.5}
-
-    # 누락 방지
-    scores = {k: float(place_softscores.get(k, 0.0)) for k in centers.keys()}
-
-    # 안정적인 softmax (점수가 0~100이므로 temp로 스케일 조절)
-    max_s = max(scores.values())
-    exps = {k: math.exp((scores[k] - max_s) / max(temp, 1e-6)) for k in scores}
-    Z = sum(exps.values()) or 1.0
-    w = {k: exps[k] / Z for k in exps}
-
-    # 가중평균 위치
-    x = sum(w[k] * centers[k] for k in centers)
-    return x
-
 def place_to_x_center(place: str) -> float:
     # labial/alveolar/velar -> x center (0.5, 1.5, 2.5)
     centers = {"labial": 0.5, "alveolar": 1.5, "velar": 2.5}
@@ -85,8 +61,6 @@ def place_to_group_label(place: str) -> str:
     return labels.get(place, str(place))
 
 def plot_stop_debug(result: dict, out_dir: Path | None = None, show: bool = True):
-    softscores = result["evaluation"].get("place_softscores", {})
-    x_user = x_from_place_softscores(softscores, temp=12.0)
     syllable = result.get("syllable", "?")
     plots = result["evaluation"]["plots"]
     targets = result.get("targets", {})
@@ -113,7 +87,6 @@ def plot_stop_debug(result: dict, out_dir: Path | None = None, show: bool = True
     detected_place = result["evaluation"].get("detected_place", None)
     target_place = targets.get("place", None)
 
-    softscores = result["evaluation"].get("place_softscores", {}) or {}
     place_conf = float(result["evaluation"].get("place_confidence", 0.0) or 0.0)
 
     # ▲ 사용자 위치 (detected 기준 스냅)
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, Any
 
 import numpy as np
@@ -51,6 +52,13 @@ REF_DUR_SIGMA = 80.0
 SPECTRAL_WEIGHT = 0.85
 DURATION_WEIGHT = 0.15
 
+# Reference tables frozen as arrays in a fixed label order,
+# so every label is scored in one vector op (index by position).
+FRICATIVE_LABELS = ("s", "ss", "h")
+CENT_MU = np.array([REF_CENTROID_HZ[l] for l in FRICATIVE_LABELS], dtype=np.float64)
+HF_MU = np.array([REF_HF_CONTRAST_DB[l] for l in FRICATIVE_LABELS], dtype=np.float64)
+DUR_MU = np.array([REF_DURATION_MS[l] for l in FRICATIVE_LABELS], dtype=np.float64)
+
 
 # ============================================================
 # 2) Audio utilities
@@ -63,12 +71,23 @@ def load_sound(path: str) -> Tuple[parselmouth.Sound, np.ndarray, int]:
     return snd, y, sr
 
 
-def bandpass(sig: np.ndarray, sr: int, low: float, high: float, order: int = 4) -> np.ndarray:
+@lru_cache(maxsize=32)
+def _butter_bandpass_sos(sr: int, low: float, high: float, order: int) -> np.ndarray:
+    # fixed recipes (hiss / breath bands) -> design once per sr
     nyq = sr / 2.0
     lo = max(low / nyq, 1e-4)
     hi = min(high / nyq, 0.999)
-    b, a = scipy.signal.butter(order, [lo, hi], btype="band")
-    return scipy.signal.lfilter(b, a, sig)
+    return scipy.signal.butter(order, [lo, hi], btype="band", output="sos")
+
+
+def bandpass(sig: np.ndarray, sr: int, low: float, high: float, order: int = 4) -> np.ndarray:
+    return scipy.signal.sosfilt(_butter_bandpass_sos(sr, low, high, order), sig)
+
+
+@lru_cache(maxsize=16)
+def _hann(n: int) -> np.ndarray:
+    # same periodic Hann that welch(window="hann") would build on every call
+    return scipy.signal.windows.hann(n, sym=False)
 
 
 def preemphasis(sig: np.ndarray, coef: float = 0.97) -> np.ndarray:
@@ -91,29 +110,31 @@ def trim_by_intensity(
     try:
         intensity = snd.to_intensity(time_step=0.01)
         vals = intensity.values.T.flatten()
-        times = np.array(
-            [intensity.get_time_from_frame_number(i + 1) for i in range(len(vals))],
-            dtype=np.float64,
-        )
 
         vmax = float(np.max(vals)) if vals.size else 0.0
         if vmax <= 1e-6:
             return y, 0.0
 
         thr = vmax - silence_db_below_peak
-        active = np.where(vals >= thr)[0]
-        if active.size == 0:
+        mask = vals >= thr
+        if not mask.any():
             return y, 0.0
 
-        t0 = max(0.0, float(times[active[0]]) - pad_s)
-        t1 = min(float(snd.get_total_duration()), float(times[active[-1]]) + pad_s)
+        # only the first/last active frames matter: frame index -> time directly
+        first = int(mask.argmax())
+        last = mask.size - 1 - int(mask[::-1].argmax())
+        t_origin = float(intensity.get_time_from_frame_number(1))
+        dt = float(intensity.get_time_step())
+
+        t0 = max(0.0, t_origin + first * dt - pad_s)
+        t1 = min(float(snd.get_total_duration()), t_origin + last * dt + pad_s)
 
         a = int(max(0, math.floor(t0 * sr)))
         b = int(min(len(y), math.ceil(t1 * sr)))
         if b <= a:
             return y, 0.0
 
-        return y[a:b].copy(), float(t0)
+        return y[a:b], float(t0)
     except Exception:
         return y, 0.0
 
@@ -194,30 +215,34 @@ def compute_spectral_features(
 ) -> Dict[str, Optional[float]]:
 
     if t_end <= t_start:
-        return {"centroid": None, "hf_contrast": None}
+        return {"centroid": None, "hf_contrast_db": None}
 
     a = int(max(0, math.floor(t_start * sr)))
     b = int(min(len(y), math.ceil(t_end * sr)))
     seg = y[a:b].astype(np.float64)
     if seg.size < int(0.02 * sr):
-        return {"centroid": None, "hf_contrast": None}
+        return {"centroid": None, "hf_contrast_db": None}
 
     seg = preemphasis(seg, 0.97)
     seg = seg - float(np.mean(seg))
 
-    freqs, pxx = scipy.signal.welch(seg, fs=sr, nperseg=min(1024, seg.size))
+    nperseg = min(1024, seg.size)
+    freqs, pxx = scipy.signal.welch(seg, fs=sr, window=_hann(nperseg), nperseg=nperseg)
     pxx = np.maximum(pxx, 1e-18)
 
+    # freqs is monotonic -> band edges by searchsorted, band sums by prefix sums
+    # (one cumsum pass instead of one masked sum per band)
+    i500, i1500, i4000 = np.searchsorted(freqs, [500.0, 1500.0, 4000.0], side="left")
+    i8000 = int(np.searchsorted(freqs, 8000.0, side="right"))
+    cum_p = np.concatenate(([0.0], np.cumsum(pxx)))
+    cum_fp = np.concatenate(([0.0], np.cumsum(freqs * pxx)))
+
     # centroid (0.5–8k)
-    band = (freqs >= 500.0) & (freqs <= 8000.0)
-    freqs_b = freqs[band]
-    p_b = pxx[band]
-    w = p_b / float(np.sum(p_b))
-    centroid = float(np.sum(freqs_b * w))
+    centroid = float((cum_fp[i8000] - cum_fp[i500]) / (cum_p[i8000] - cum_p[i500]))
 
     # 🔴 HF contrast
-    e_low = float(np.sum(pxx[(freqs >= 500.0) & (freqs < 1500.0)]))
-    e_high = float(np.sum(pxx[(freqs >= 4000.0) & (freqs <= 8000.0)]))
+    e_low = float(cum_p[i1500] - cum_p[i500])
+    e_high = float(cum_p[i8000] - cum_p[i4000])
     #hf_contrast = float(math.log((e_high + 1e-12) / (e_low + 1e-12)))
     ratio = (e_high + 1e-12) / (e_low + 1e-12)
     hf_contrast_db = 10.0 * math.log10(ratio)
@@ -230,22 +255,25 @@ def compute_spectral_features(
 # 6) Scoring
 # ============================================================
 
-def gaussian_score(x: float, mu: float, sigma: float) -> float:
-    return float(100.0 * math.exp(-((x - mu) ** 2) / (2.0 * sigma * sigma)))
+def _gaussian_scores(x: float, mu: np.ndarray, sigma: float) -> np.ndarray:
+    d = x - mu
+    return 100.0 * np.exp(-(d * d) / (2.0 * sigma * sigma))
 
 
-def score_spectral(centroid, hf_contrast, target):
+def score_spectral(centroid, hf_contrast) -> Optional[np.ndarray]:
+    """Spectral score for every label in FRICATIVE_LABELS order."""
     if centroid is None or hf_contrast is None:
         return None
-    sc1 = gaussian_score(centroid, REF_CENTROID_HZ[target], REF_CENTROID_SIGMA)
-    sc2 = gaussian_score(hf_contrast, REF_HF_CONTRAST_DB[target], REF_HF_CONTRAST_DB_SIGMA)
+    sc1 = _gaussian_scores(centroid, CENT_MU, REF_CENTROID_SIGMA)
+    sc2 = _gaussian_scores(hf_contrast, HF_MU, REF_HF_CONTRAST_DB_SIGMA)
     return 0.6 * sc1 + 0.4 * sc2
 
 
-def score_duration(dur_ms, target):
+def score_duration(dur_ms) -> Optional[np.ndarray]:
+    """Duration score for every label in FRICATIVE_LABELS order."""
     if dur_ms is None:
         return None
-    return gaussian_score(dur_ms, REF_DURATION_MS[target], REF_DUR_SIGMA)
+    return _gaussian_scores(dur_ms, DUR_MU, REF_DUR_SIGMA)
 
 
 def final_score(spec, dur):
@@ -303,27 +331,56 @@ def analyze_fricative(wav_path: str, syllable: str) -> Dict[str, Any]:
     snd, y, sr = load_sound(wav_path)
     y_trim, offset_s = trim_by_intensity(snd, y, sr)
 
+    # near-silent / clipped input: nothing to band-filter or score
+    if y_trim.size < int(0.03 * sr):
+        return {
+            "syllable": syllable,
+            "type": "fricative",
+            "targets": {"fricative": target},
+            "features": {
+                "spectral_centroid_hz": None,
+                "hf_contrast": None,
+                "duration_ms": 0.0,
+                "trim_offset_s": offset_s,
+                "fric_start_t": None,
+                "fric_end_t": None,
+            },
+            "evaluation": {
+                "detected_fricative": None,
+                "spectral_score": None,
+                "duration_score": None,
+                "final_score": 0.0,
+                "softscores": {},
+                "confidence": 0.0,
+            },
+            "feedback": {
+                "text": "The recording is too short or too quiet. Try again: speak closer to the mic and keep the hiss steady.",
+            },
+        }
+
     fric_start_t, fric_end_t = detect_frication_region_peak(y_trim, sr)
 
     feats = compute_spectral_features(y_trim, sr, fric_start_t, fric_end_t)
     duration_ms = (fric_end_t - fric_start_t) * 1000.0
 
-    spec_score = score_spectral(feats["centroid"], feats["hf_contrast_db"], target)
-    dur_score = score_duration(duration_ms, target)
-    fs = final_score(spec_score, dur_score)
+    spec_all = score_spectral(feats["centroid"], feats["hf_contrast_db"])
+    dur_all = score_duration(duration_ms)
+    fs_all = final_score(spec_all, dur_all)
+
+    ti = FRICATIVE_LABELS.index(target)
+    spec_score = float(spec_all[ti]) if spec_all is not None else None
+    dur_score = float(dur_all[ti]) if dur_all is not None else None
+    fs = float(fs_all[ti]) if fs_all is not None else None
 
-    soft = {}
-    for lab in ("s", "ss", "h"):
-        soft[lab] = final_score(
-            score_spectral(feats["centroid"], feats["hf_contrast_db"], lab),
-            score_duration(duration_ms, lab),
-        ) or 0.0
+    if fs_all is None:
+        fs_all = np.zeros(len(FRICATIVE_LABELS))
+    soft = dict(zip(FRICATIVE_LABELS, fs_all.tolist()))
 
-    detected = max(soft, key=soft.get)
+    bi = int(np.argmax(fs_all))
+    detected = FRICATIVE_LABELS[bi]
 
-    # Confidence: gap between best and second-best
-    sorted_scores = sorted(soft.items(), key=lambda kv: kv[1], reverse=True)
-    conf = float(sorted_scores[0][1] - sorted_scores[1][1]) / 100.0 if len(sorted_scores) >= 2 else 0.0
+    # Confidence: gap between best and second-best (top-2 without a sort)
+    conf = float(fs_all[bi] - np.partition(fs_all, -2)[-2]) / 100.0 if fs_all.size >= 2 else 0.0
     conf = max(0.0, min(1.0, conf))
 
     feedback_text = generate_feedback(target, detected, feats["centroid"], feats["hf_contrast_db"])
@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, Any
 
 import numpy as np
 import scipy.signal
+from scipy.ndimage import uniform_filter1d
 import parselmouth
 
 
@@ -50,6 +52,26 @@ W_CENTROID = 0.20
 W_FRIC = 0.10
 W_VOICED = 0.10
 
+# softscore order used by the batched scorer
+SCORE_KEYS = ("f3", "closure_depth", "smoothness", "non_fricative", "voicing")
+SCORE_MU = np.array([
+    REF_F3_ONSET_HZ["liquid"],
+    REF_CLOSURE_DEPTH_DB["liquid"],
+    REF_CENTROID_HZ["liquid"],
+    REF_FRIC_RATIO_PEAK["liquid"],
+    REF_VOICED_FRAC["liquid"],
+], dtype=np.float64)
+SCORE_SIGMA = np.array([
+    REF_F3_SIGMA,
+    REF_CLOSURE_DEPTH_SIGMA,
+    REF_CENTROID_SIGMA,
+    REF_FRIC_RATIO_SIGMA,
+    REF_VOICED_FRAC_SIGMA,
+], dtype=np.float64)
+# exponent factors 1/(2*sigma^2), fixed at import
+SCORE_INV_2S2 = 1.0 / (2.0 * SCORE_SIGMA ** 2)
+SCORE_W = np.array([W_F3, W_CLOSURE, W_CENTROID, W_FRIC, W_VOICED], dtype=np.float64)
+
 
 # ============================================================
 # 2) Audio utilities
@@ -57,17 +79,27 @@ W_VOICED = 0.10
 
 def load_sound(path: str) -> Tuple[parselmouth.Sound, np.ndarray, int]:
     snd = parselmouth.Sound(path)
-    y = snd.values.T.flatten().astype(np.float64)
+    vals = snd.values  # (channels, samples), already float64
+    # mono: a view on the Sound's buffer, no copy; multi-channel: downmix
+    y = vals[0] if vals.shape[0] == 1 else vals.mean(axis=0)
+    y = np.ascontiguousarray(y, dtype=np.float64)
     sr = int(round(snd.sampling_frequency))
     return snd, y, sr
 
 
-def bandpass(sig: np.ndarray, sr: int, low: float, high: float, order: int = 4) -> np.ndarray:
+@lru_cache(maxsize=64)
+def _butter_bandpass_sos(sr: int, low: float, high: float, order: int) -> np.ndarray:
+    # fixed recipes (e.g. 80-4000 Hz onset band) -> design once per sr
     nyq = sr / 2.0
     lo = max(low / nyq, 1e-4)
     hi = min(high / nyq, 0.999)
-    b, a = scipy.signal.butter(order, [lo, hi], btype="band")
-    return scipy.signal.lfilter(b, a, sig)
+    return scipy.signal.butter(order, [lo, hi], btype="band", output="sos")
+
+
+def bandpass(sig: np.ndarray, sr: int, low: float, high: float, order: int = 4) -> np.ndarray:
+    # envelope-only use (onset detection): filter in float32, design stays float64
+    sos32 = _butter_bandpass_sos(sr, low, high, order).astype(np.float32)
+    return scipy.signal.sosfilt(sos32, sig.astype(np.float32, copy=False))
 
 
 def _moving_average(x: np.ndarray, win: int) -> np.ndarray:
@@ -77,16 +109,34 @@ def _moving_average(x: np.ndarray, win: int) -> np.ndarray:
     win = max(3, win)
     if win % 2 == 0:
         win += 1
-    k = np.ones(win, dtype=np.float64) / float(win)
-    return np.convolve(x, k, mode="same")
+    # running-sum box filter: O(N) regardless of window width
+    return uniform_filter1d(x, size=win, mode="nearest")
+
+
+@lru_cache(maxsize=8)
+def _frame_sizes(sr: int) -> Dict[str, int]:
+    """
+    Every sample-count constant of the liquid pipeline, resolved once per sample rate
+    (deployments record at one or two rates, so this is effectively a constant table).
+    """
+    return {
+        "min_seg": int(0.02 * sr),
+        "min_trim": int(0.03 * sr),
+        "min_onset": int(0.05 * sr),
+        "onset_smooth": max(5, int(0.005 * sr)),
+        "closure_win": max(int(0.010 * sr), 128),
+        "closure_hop": max(int(0.005 * sr), 64),
+        "fric_win": max(int(0.020 * sr), 256),
+        "fric_hop": max(int(0.010 * sr), 128),
+    }
 
 
 def _safe_segment(y: np.ndarray, sr: int, t0: float, dur_s: float) -> Optional[np.ndarray]:
     a = int(max(0, round(t0 * sr)))
     b = int(min(y.size, round((t0 + dur_s) * sr)))
-    if b - a < int(0.02 * sr):
+    if b - a < _frame_sizes(sr)["min_seg"]:
         return None
-    return y[a:b].copy()
+    return y[a:b]
 
 
 # ============================================================
@@ -103,26 +153,28 @@ def trim_by_intensity(
     try:
         intensity = snd.to_intensity(time_step=0.01)
         vals = intensity.values.T.flatten()
-        times = np.array(
-            [intensity.get_time_from_frame_number(i + 1) for i in range(len(vals))],
-            dtype=np.float64,
-        )
 
         vmax = float(np.max(vals)) if vals.size else 0.0
         thr = vmax - silence_db_below_peak
-        active = np.where(vals >= thr)[0]
-        if active.size == 0:
+        mask = vals >= thr
+        if not mask.any():
             return y, 0.0
 
-        t0 = max(0.0, float(times[active[0]]) - pad_s)
-        t1 = min(float(snd.get_total_duration()), float(times[active[-1]]) + pad_s)
+        # only the first/last active frames matter: frame index -> time directly
+        first = int(mask.argmax())
+        last = mask.size - 1 - int(mask[::-1].argmax())
+        t_origin = float(intensity.get_time_from_frame_number(1))
+        dt = float(intensity.get_time_step())
+
+        t0 = max(0.0, t_origin + first * dt - pad_s)
+        t1 = min(float(snd.get_total_duration()), t_origin + last * dt + pad_s)
 
         a = int(max(0, math.floor(t0 * sr)))
         b = int(min(len(y), math.ceil(t1 * sr)))
         if b <= a:
             return y, 0.0
 
-        return y[a:b].copy(), float(t0)
+        return y[a:b], float(t0)
     except Exception:
         return y, 0.0
 
@@ -132,7 +184,8 @@ def trim_by_intensity(
 # ============================================================
 
 def estimate_onset_t(y: np.ndarray, sr: int) -> Optional[float]:
-    if y.size < int(0.05 * sr):
+    sizes = _frame_sizes(sr)
+    if y.size < sizes["min_onset"]:
         return None
 
     y_bp = bandpass(y, sr, 80.0, 4000.0)
@@ -141,7 +194,7 @@ def estimate_onset_t(y: np.ndarray, sr: int) -> Optional[float]:
     if peak <= 0.0:
         return None
 
-    env_s = _moving_average(env, win=max(5, int(0.005 * sr)))
+    env_s = _moving_average(env, win=sizes["onset_smooth"])
     thr = 0.06 * peak
     idx = np.where(env_s >= thr)[0]
     if idx.size == 0:
@@ -153,8 +206,7 @@ def estimate_onset_t(y: np.ndarray, sr: int) -> Optional[float]:
 # 5) Feature extraction
 # ============================================================
 
-def estimate_f3_onset_hz(y: np.ndarray, sr: int, onset_t: float) -> Optional[float]:
-    snd = parselmouth.Sound(y.astype(np.float64), sampling_frequency=sr)
+def estimate_f3_onset_hz(snd: parselmouth.Sound, onset_t: float) -> Optional[float]:
     total = float(snd.get_total_duration())
 
     t = float(onset_t + 0.060)
@@ -176,21 +228,25 @@ def compute_closure_depth_db(y: np.ndarray, sr: int, onset_t: float) -> Optional
     if seg is None:
         return None
 
-    win = max(int(0.010 * sr), 128)
-    hop = max(int(0.005 * sr), 64)
+    sizes = _frame_sizes(sr)
+    win, hop = sizes["closure_win"], sizes["closure_hop"]
     n = 1 + max(0, (seg.size - win) // hop)
     if n <= 3:
         return None
 
-    e = np.zeros(n, dtype=np.float64)
-    for i in range(n):
-        a = i * hop
-        b = a + win
-        x = seg[a:b]
-        e[i] = float(np.mean(x * x) + 1e-12)
-
-    med = float(np.median(e))
-    mn = float(np.min(e))
+    # all frame energies in one strided reduction (rows = frames)
+    frames = np.lib.stride_tricks.sliding_window_view(seg, win)[::hop]
+    e = np.einsum("ij,ij->i", frames, frames) * (1.0 / win) + 1e-12
+
+    # median and min from one introselect instead of a sort + separate min
+    k = e.size // 2
+    if e.size % 2:
+        part = np.partition(e, (0, k))
+        med = float(part[k])
+    else:
+        part = np.partition(e, (0, k - 1, k))
+        med = 0.5 * float(part[k - 1] + part[k])
+    mn = float(part[0])
     if med <= 0.0 or mn <= 0.0:
         return None
 
@@ -198,17 +254,29 @@ def compute_closure_depth_db(y: np.ndarray, sr: int, onset_t: float) -> Optional
     return float(np.clip(depth_db, 0.0, 30.0))
 
 
-def compute_centroid_hz(y: np.ndarray, sr: int, onset_t: float) -> Optional[float]:
-    # early 60ms slice
-    seg = _safe_segment(y, sr, onset_t + 0.010, 0.060)
-    if seg is None:
-        return None
-
-    seg = seg.astype(np.float64)
+def _compute_psd(seg: np.ndarray, sr: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Welch PSD (1024-sample Hann segments, 50% overlap) of a short slice.
+    Computed once per slice so several spectral features can share it.
+    """
     seg = seg - float(np.mean(seg))
-
     freqs, pxx = scipy.signal.welch(seg, fs=sr, nperseg=min(1024, seg.size))
-    pxx = np.maximum(pxx, 1e-18)
+    return freqs, np.maximum(pxx, 1e-18)
+
+
+def compute_centroid_hz(
+    y: np.ndarray,
+    sr: int,
+    onset_t: float,
+    psd: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Optional[float]:
+    if psd is None:
+        # early 60ms slice
+        seg = _safe_segment(y, sr, onset_t + 0.010, 0.060)
+        if seg is None:
+            return None
+        psd = _compute_psd(seg, sr)
+    freqs, pxx = psd
 
     band = (freqs >= 0) & (freqs <= 3000)
     denom = float(np.sum(pxx[band]))
@@ -229,26 +297,24 @@ def compute_frication_ratio_peak(y: np.ndarray, sr: int, onset_t: float) -> Opti
     if seg is None:
         return None
 
-    hf = bandpass(seg, sr, 3000.0, 8000.0)
-    lf = bandpass(seg, sr, 300.0, 2000.0)
+    # band ratios are compared against fixed thresholds: filter in float64
+    hf = scipy.signal.sosfilt(_butter_bandpass_sos(sr, 3000.0, 8000.0, 4), seg)
+    lf = scipy.signal.sosfilt(_butter_bandpass_sos(sr, 300.0, 2000.0, 4), seg)
 
-    win = max(int(0.020 * sr), 256)
-    hop = max(int(0.010 * sr), 128)
+    sizes = _frame_sizes(sr)
+    win, hop = sizes["fric_win"], sizes["fric_hop"]
     n = 1 + max(0, (seg.size - win) // hop)
     if n <= 2:
         return None
 
-    ratios = []
-    for i in range(n):
-        a = i * hop
-        b = a + win
-        h = hf[a:b]
-        l = lf[a:b]
-        rh = math.sqrt(float(np.mean(h * h) + 1e-12))
-        rl = math.sqrt(float(np.mean(l * l) + 1e-12))
-        ratios.append(rh / (rl + 1e-12))
-
-    rpk = float(np.max(ratios)) if ratios else None
+    # per-frame band energies in one strided pass (no per-frame temporaries)
+    fh = np.lib.stride_tricks.sliding_window_view(hf, win)[::hop]
+    fl = np.lib.stride_tricks.sliding_window_view(lf, win)[::hop]
+    rh = np.sqrt(np.einsum("ij,ij->i", fh, fh) * (1.0 / win) + 1e-12)
+    rl = np.sqrt(np.einsum("ij,ij->i", fl, fl) * (1.0 / win) + 1e-12)
+    ratios = rh / (rl + 1e-12)
+
+    rpk = float(np.max(ratios)) if ratios.size else None
     if rpk is None or not np.isfinite(rpk):
         return None
     return float(np.clip(rpk, 0.0, 10.0))
@@ -276,10 +342,15 @@ def compute_voiced_fraction(y: np.ndarray, sr: int, onset_t: float) -> Optional[
 # 6) Scoring + reject
 # ============================================================
 
-def gaussian_score(x: Optional[float], mu: float, sigma: float) -> Optional[float]:
-    if x is None:
-        return None
-    return 100.0 * math.exp(-((x - mu) ** 2) / (2 * sigma ** 2))
+def _score_all(feats: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    All Gaussian softscores (SCORE_KEYS order) and the weighted final score
+    in one numpy pass. Missing features are NaN and score 0.
+    """
+    d = feats - SCORE_MU
+    soft = 100.0 * np.exp(-(d * d) * SCORE_INV_2S2)
+    soft = np.where(np.isnan(soft), 0.0, soft)
+    return soft, float(soft @ SCORE_W)
 
 
 def _confidence_from_softscores(scores: Dict[str, float]) -> float:
@@ -297,47 +368,61 @@ def _confidence_from_softscores(scores: Dict[str, float]) -> float:
 # 7) Feedback
 # ============================================================
 
+REJECT_FEEDBACK = {
+    "too_fricative": (
+        "This sounds too hissy (like '사'). "
+        "For '라', do NOT blow air. Lightly tap your tongue once behind your teeth, then go straight into '아'."
+    ),
+    "too_unvoiced": (
+        "This sounds too unvoiced. "
+        "For '라', keep your voice on (a gentle hum) while you tap your tongue, then move into '아'."
+    ),
+    "no_tongue_contact": (
+        "It sounds too smooth, like it skipped the tongue touch. "
+        "For '라', make one quick tongue tap behind your teeth before the vowel."
+    ),
+}
+REJECT_FEEDBACK_DEFAULT = "Try again: tap your tongue lightly behind your teeth and move into the vowel smoothly."
+
+FEEDBACK_GOOD = (
+    "Good job! This sounds like '라'. "
+    "Touch your tongue quickly to the ridge behind your teeth, then move smoothly into the vowel."
+)
+FEEDBACK_CLOSE = (
+    "Close! Make the tongue touch clearer but still quick. "
+    "Do not add a hiss—go straight into the vowel."
+)
+FEEDBACK_POOR = (
+    "Not quite yet. For '라', avoid a hissy start. "
+    "Tap your tongue lightly behind your teeth and move into '아' immediately."
+)
+
+
 def generate_feedback(is_rejected: bool, reject_reason: str, final_score: float) -> str:
     if is_rejected:
-        if reject_reason == "too_fricative":
-            return (
-                "This sounds too hissy (like '사'). "
-                "For '라', do NOT blow air. Lightly tap your tongue once behind your teeth, then go straight into '아'."
-            )
-        if reject_reason == "too_unvoiced":
-            return (
-                "This sounds too unvoiced. "
-                "For '라', keep your voice on (a gentle hum) while you tap your tongue, then move into '아'."
-            )
-        if reject_reason == "no_tongue_contact":
-            return (
-                "It sounds too smooth, like it skipped the tongue touch. "
-                "For '라', make one quick tongue tap behind your teeth before the vowel."
-            )
-        return "Try again: tap your tongue lightly behind your teeth and move into the vowel smoothly."
-
+        return REJECT_FEEDBACK.get(reject_reason, REJECT_FEEDBACK_DEFAULT)
     if final_score >= 75.0:
-        return (
-            "Good job! This sounds like '라'. "
-            "Touch your tongue quickly to the ridge behind your teeth, then move smoothly into the vowel."
-        )
-
+        return FEEDBACK_GOOD
     if final_score >= 60.0:
-        return (
-            "Close! Make the tongue touch clearer but still quick. "
-            "Do not add a hiss—go straight into the vowel."
-        )
-
-    return (
-        "Not quite yet. For '라', avoid a hissy start. "
-        "Tap your tongue lightly behind your teeth and move into '아' immediately."
-    )
+        return FEEDBACK_CLOSE
+    return FEEDBACK_POOR
 
 
 # ============================================================
 # 8) Main API
 # ============================================================
 
+def _early_reject(syllable: str, target_place: str, reason: str, text: str) -> Dict[str, Any]:
+    return {
+        "syllable": syllable,
+        "type": "liquid",
+        "targets": {"place": target_place, "liquid": True},
+        "features": {},
+        "evaluation": {"final_score": 0.0, "is_rejected": True, "reject_reason": reason},
+        "feedback": {"text": text},
+    }
+
+
 def analyze_liquid(wav_path: str, syllable: str) -> Dict[str, Any]:
     if syllable not in LIQUID_SET:
         return {"error": "Unsupported liquid syllable (supported: 라)"}
@@ -347,50 +432,28 @@ def analyze_liquid(wav_path: str, syllable: str) -> Dict[str, Any]:
     snd, y, sr = load_sound(wav_path)
     y_trim, offset = trim_by_intensity(snd, y, sr)
 
+    # near-silent / clipped input: skip filtering, formants and pitch entirely
+    if y_trim.size < _frame_sizes(sr)["min_trim"]:
+        return _early_reject(
+            syllable, target_place, "too_short",
+            "The recording is too short or too quiet. Try again closer to the mic and hold '라' a bit longer.",
+        )
+
     onset_t = estimate_onset_t(y_trim, sr)
     if onset_t is None:
-        return {
-            "syllable": syllable,
-            "type": "liquid",
-            "targets": {"place": target_place, "liquid": True},
-            "features": {},
-            "evaluation": {"final_score": 0.0, "is_rejected": True, "reject_reason": "no_onset"},
-            "feedback": {"text": "I couldn't find a clear onset. Try recording again closer to the mic with less background noise."},
-        }
-
-    f3 = estimate_f3_onset_hz(y_trim, sr, onset_t)
-    depth_db = compute_closure_depth_db(y_trim, sr, onset_t)
-    centroid = compute_centroid_hz(y_trim, sr, onset_t)
-    fric_pk = compute_frication_ratio_peak(y_trim, sr, onset_t)
-    voiced_frac = compute_voiced_fraction(y_trim, sr, onset_t)
-
-    s_f3 = gaussian_score(f3, REF_F3_ONSET_HZ["liquid"], REF_F3_SIGMA)
-    s_depth = gaussian_score(depth_db, REF_CLOSURE_DEPTH_DB["liquid"], REF_CLOSURE_DEPTH_SIGMA)
-    s_cent = gaussian_score(centroid, REF_CENTROID_HZ["liquid"], REF_CENTROID_SIGMA)
-    s_fric = gaussian_score(fric_pk, REF_FRIC_RATIO_PEAK["liquid"], REF_FRIC_RATIO_SIGMA)
-    s_voiced = gaussian_score(voiced_frac, REF_VOICED_FRAC["liquid"], REF_VOICED_FRAC_SIGMA)
-
-    s_f3_v = float(s_f3) if s_f3 is not None else 0.0
-    s_depth_v = float(s_depth) if s_depth is not None else 0.0
-    s_cent_v = float(s_cent) if s_cent is not None else 0.0
-    s_fric_v = float(s_fric) if s_fric is not None else 0.0
-    s_voiced_v = float(s_voiced) if s_voiced is not None else 0.0
-
-    softscores = {
-        "f3": s_f3_v,
-        "closure_depth": s_depth_v,
-        "smoothness": s_cent_v,
-        "non_fricative": s_fric_v,
-        "voicing": s_voiced_v,
-    }
+        return _early_reject(
+            syllable, target_place, "no_onset",
+            "I couldn't find a clear onset. Try recording again closer to the mic with less background noise.",
+        )
+
+    # onset sample index resolved once; every onset-relative feature window
+    # (0-90, 10-70, 0-120, 0-200 ms) is then a view into y_on at t=0
+    y_on = y_trim[int(onset_t * sr):]
 
-    final_score = float(
-        W_F3 * s_f3_v +
-        W_CLOSURE * s_depth_v +
-        W_CENTROID * s_cent_v +
-        W_FRIC * s_fric_v +
-        W_VOICED * s_voiced_v
-    )
+    # gating features first: a hard reject does not need formants or the PSD
+    depth_db = compute_closure_depth_db(y_on, sr, 0.0)
+    fric_pk = compute_frication_ratio_peak(y_on, sr, 0.0)
+    voiced_frac = compute_voiced_fraction(y_on, sr, 0.0)
 
     # ---------------------------
     # REJECT GATES (critical!)
@@ -413,8 +476,27 @@ def analyze_liquid(wav_path: str, syllable: str) -> Dict[str, Any]:
         is_rejected = True
         reject_reason = "no_tongue_contact"
 
-    # If rejected, cap final score hard (prevents false positives)
+    f3: Optional[float] = None
+    centroid: Optional[float] = None
+    if not is_rejected:
+        # Sound of the trimmed signal, built once for the formant pass
+        snd_trim = parselmouth.Sound(y_trim, sampling_frequency=sr)
+        f3 = estimate_f3_onset_hz(snd_trim, onset_t)
+        # one PSD of the early post-onset slice, shared by the spectral features
+        seg_early = _safe_segment(y_on, sr, 0.010, 0.060)
+        psd_early = _compute_psd(seg_early, sr) if seg_early is not None else None
+        centroid = compute_centroid_hz(y_on, sr, 0.0, psd=psd_early)
+
+    # Hard reject: F3 (Burg) and the centroid are never measured, so their
+    # softscores are 0; the gating features keep their real softscores
+    feats = np.array(
+        [f3, depth_db, centroid, fric_pk, voiced_frac], dtype=np.float64
+    )  # None -> nan
+    soft, final_score = _score_all(feats)
+    softscores = dict(zip(SCORE_KEYS, soft.tolist()))
+
     if is_rejected:
+        # cap the score (prevents false positives)
         final_score = min(final_score, 35.0)
 
     confidence = _confidence_from_softscores(softscores)
@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, Any
 
 import numpy as np
 import scipy.signal
+from scipy.ndimage import uniform_filter1d
 import parselmouth
 
 
@@ -51,6 +53,11 @@ REF_CENTROID_SIGMA = 350.0
 W_PLACE = 0.55
 W_NASALITY = 0.45
 
+# Gaussian exponent factors 1/(2*sigma^2), fixed at import
+INV_2S2_F2 = 1.0 / (2.0 * REF_F2_SIGMA ** 2)
+INV_2S2_LOW_RATIO = 1.0 / (2.0 * REF_LOW_RATIO_SIGMA ** 2)
+INV_2S2_CENTROID = 1.0 / (2.0 * REF_CENTROID_SIGMA ** 2)
+
 
 # ============================================================
 # 2) Audio utilities
@@ -58,17 +65,27 @@ W_NASALITY = 0.45
 
 def load_sound(path: str) -> Tuple[parselmouth.Sound, np.ndarray, int]:
     snd = parselmouth.Sound(path)
-    y = snd.values.T.flatten().astype(np.float64)
+    vals = snd.values  # (channels, samples), already float64
+    # mono: a view on the Sound's buffer, no copy; multi-channel: downmix
+    y = vals[0] if vals.shape[0] == 1 else vals.mean(axis=0)
+    y = np.ascontiguousarray(y, dtype=np.float64)
     sr = int(round(snd.sampling_frequency))
     return snd, y, sr
 
 
-def bandpass(sig: np.ndarray, sr: int, low: float, high: float, order: int = 4) -> np.ndarray:
+@lru_cache(maxsize=64)
+def _butter_bandpass_sos(sr: int, low: float, high: float, order: int) -> np.ndarray:
+    # fixed recipes (e.g. 80-4000 Hz onset band) -> design once per sr
     nyq = sr / 2.0
     lo = max(low / nyq, 1e-4)
     hi = min(high / nyq, 0.999)
-    b, a = scipy.signal.butter(order, [lo, hi], btype="band")
-    return scipy.signal.lfilter(b, a, sig)
+    return scipy.signal.butter(order, [lo, hi], btype="band", output="sos")
+
+
+def bandpass(sig: np.ndarray, sr: int, low: float, high: float, order: int = 4) -> np.ndarray:
+    # envelope-only use (onset detection): filter in float32, design stays float64
+    sos32 = _butter_bandpass_sos(sr, low, high, order).astype(np.float32)
+    return scipy.signal.sosfilt(sos32, sig.astype(np.float32, copy=False))
 
 
 def preemphasis(sig: np.ndarray, coef: float = 0.97) -> np.ndarray:
@@ -84,8 +101,8 @@ def _moving_average(x: np.ndarray, win: int) -> np.ndarray:
     win = max(3, win)
     if win % 2 == 0:
         win += 1
-    k = np.ones(win, dtype=np.float64) / float(win)
-    return np.convolve(x, k, mode="same")
+    # running-sum box filter: O(N) regardless of window width
+    return uniform_filter1d(x, size=win, mode="nearest")
 
 
 # ============================================================
@@ -102,26 +119,27 @@ def trim_by_intensity(
     try:
         intensity = snd.to_intensity(time_step=0.01)
         vals = intensity.values.T.flatten()
-        times = np.array(
-            [intensity.get_time_from_frame_number(i + 1) for i in range(len(vals))],
-            dtype=np.float64,
-        )
 
         vmax = float(np.max(vals)) if vals.size else 0.0
         thr = vmax - silence_db_below_peak
-        active = np.where(vals >= thr)[0]
-        if active.size == 0:
+        mask = vals >= thr
+        if not mask.any():
             return y, 0.0
+        # only the first/last active frames matter: frame index -> time directly
+        first = int(mask.argmax())
+        last = mask.size - 1 - int(mask[::-1].argmax())
+        t_origin = float(intensity.get_time_from_frame_number(1))
+        dt = float(intensity.get_time_step())
 
-        t0 = max(0.0, float(times[active[0]]) - pad_s)
-        t1 = min(float(snd.get_total_duration()), float(times[active[-1]]) + pad_s)
+        t0 = max(0.0, t_origin + first * dt - pad_s)
+        t1 = min(float(snd.get_total_duration()), t_origin + last * dt + pad_s)
 
         a = int(max(0, math.floor(t0 * sr)))
         b = int(min(len(y), math.ceil(t1 * sr)))
         if b <= a:
             return y, 0.0
 
-        return y[a:b].copy(), float(t0)
+        return y[a:b], float(t0)
     except Exception:
         return y, 0.0
 
@@ -161,7 +179,7 @@ def _safe_segment(y: np.ndarray, sr: int, t0: float, dur_s: float) -> Optional[n
     b = int(min(y.size, round((t0 + dur_s) * sr)))
     if b - a < int(0.02 * sr):
         return None
-    return y[a:b].copy()
+    return y[a:b]
 
 
 def compute_nasal_window_features(
@@ -178,7 +196,7 @@ def compute_nasal_window_features(
     if seg is None:
         return None, None
 
-    seg = seg.astype(np.float64)
+    seg = seg.astype(np.float64, copy=False)
     seg = seg - float(np.mean(seg))
 
     freqs, pxx = scipy.signal.welch(seg, fs=sr, nperseg=min(1024, seg.size))
@@ -199,8 +217,7 @@ def compute_nasal_window_features(
 
 
 def estimate_f2_onset_hz(
-    y: np.ndarray,
-    sr: int,
+    snd: parselmouth.Sound,
     onset_t: float,
 ) -> Optional[float]:
     """
@@ -209,7 +226,6 @@ def estimate_f2_onset_hz(
     if not np.isfinite(onset_t):
         return None
 
-    snd = parselmouth.Sound(y.astype(np.float64), sampling_frequency=sr)
     total = float(snd.get_total_duration())
 
     t = float(onset_t + 0.060)
@@ -229,15 +245,17 @@ def estimate_f2_onset_hz(
 # 6) Scoring
 # ============================================================
 
-def gaussian_score(x: Optional[float], mu: float, sigma: float) -> Optional[float]:
+def gaussian_score(x: Optional[float], mu: float, inv_2s2: float) -> Optional[float]:
+    # inv_2s2 = 1 / (2 * sigma^2), see INV_2S2_* above
     if x is None:
         return None
-    return 100.0 * math.exp(-((x - mu) ** 2) / (2 * sigma ** 2))
+    d = x - mu
+    return 100.0 * math.exp(-d * d * inv_2s2)
 
 
 def _score_nasality(low_ratio: Optional[float], centroid: Optional[float]) -> Optional[float]:
-    s_lr = gaussian_score(low_ratio, REF_LOW_RATIO["nasal"], REF_LOW_RATIO_SIGMA)
-    s_c = gaussian_score(centroid, REF_CENTROID_HZ["nasal"], REF_CENTROID_SIGMA)
+    s_lr = gaussian_score(low_ratio, REF_LOW_RATIO["nasal"], INV_2S2_LOW_RATIO)
+    s_c = gaussian_score(centroid, REF_CENTROID_HZ["nasal"], INV_2S2_CENTROID)
     if s_lr is None or s_c is None:
         return None
     return 0.55 * s_lr + 0.45 * s_c
@@ -334,6 +352,38 @@ def generate_feedback(
 # 8) Main API
 # ============================================================
 
+NO_ONSET_FEEDBACK = (
+    "I couldn't find a clear nasal onset. Try recording again closer to the mic with less background noise."
+)
+
+
+def _nasal_result(
+    syllable: str,
+    target_place: str,
+    features: Optional[Tuple[float, Optional[float], Optional[float], Optional[float]]],
+    evaluation: Dict[str, Any],
+    feedback_text: str,
+) -> Dict[str, Any]:
+    """
+    Single place that fixes the response layout for both the success and the no-onset path.
+    features = (onset_t, f2, low_ratio, centroid), or None when nothing was measured.
+    """
+    onset_t, f2, low_ratio, centroid = features if features is not None else (None, None, None, None)
+    return {
+        "syllable": syllable,
+        "type": "nasal",
+        "targets": {"place": target_place, "nasal": True},
+        "features": {
+            "onset_t": onset_t,
+            "f2_onset_hz": f2,
+            "low_ratio_0_500_over_0_2000": low_ratio,
+            "spectral_centroid_hz": centroid,
+        },
+        "evaluation": evaluation,
+        "feedback": {"text": feedback_text},
+    }
+
+
 def analyze_nasal(wav_path: str, syllable: str) -> Dict[str, Any]:
     if syllable not in NASAL_SET:
         return {"error": "Unsupported nasal syllable (supported: 마, 나)"}
@@ -345,34 +395,26 @@ def analyze_nasal(wav_path: str, syllable: str) -> Dict[str, Any]:
 
     onset_t = estimate_onset_t(y_trim, sr)
     if onset_t is None:
-        return {
-            "syllable": syllable,
-            "type": "nasal",
-            "targets": {"place": target_place, "nasal": True},
-            "features": {
-                "onset_t": None,
-                "f2_onset_hz": None,
-                "low_ratio_0_500_over_0_2000": None,
-                "spectral_centroid_hz": None,
-            },
-            "evaluation": {
+        return _nasal_result(
+            syllable, target_place,
+            features=None,
+            evaluation={
                 "detected_place": None,
                 "softscores": {},
                 "final_score": 0.0,
                 "confidence": {"place_margin": 0.0, "overall_confidence": 0.0},
             },
-            "feedback": {
-                "text": "I couldn't find a clear nasal onset. Try recording again closer to the mic with less background noise."
-            },
-        }
+            feedback_text=NO_ONSET_FEEDBACK,
+        )
 
     low_ratio, centroid = compute_nasal_window_features(y_trim, sr, onset_t)
-    f2 = estimate_f2_onset_hz(y_trim, sr, onset_t)
+    snd_trim = parselmouth.Sound(y_trim, sampling_frequency=sr)
+    f2 = estimate_f2_onset_hz(snd_trim, onset_t)
 
     # place scores
     place_scores: Dict[str, float] = {}
     for place in ("labial", "alveolar"):
-        s_f2 = gaussian_score(f2, REF_F2_ONSET_HZ[place], REF_F2_SIGMA)
+        s_f2 = gaussian_score(f2, REF_F2_ONSET_HZ[place], INV_2S2_F2)
         place_scores[place] = float(s_f2 if s_f2 is not None else 0.0)
 
     detected_place = max(place_scores, key=place_scores.get) if place_scores else target_place
@@ -400,17 +442,10 @@ def analyze_nasal(wav_path: str, syllable: str) -> Dict[str, Any]:
         nasality_score=s_nasal,
     )
 
-    return {
-        "syllable": syllable,
-        "type": "nasal",
-        "targets": {"place": target_place, "nasal": True},
-        "features": {
-            "onset_t": float(onset_t),
-            "f2_onset_hz": f2,
-            "low_ratio_0_500_over_0_2000": low_ratio,
-            "spectral_centroid_hz": centroid,
-        },
-        "evaluation": {
+    return _nasal_result(
+        syllable, target_place,
+        features=(float(onset_t), f2, low_ratio, centroid),
+        evaluation={
             "detected_place": detected_place,
             "softscores": {
                 "place_labial": float(place_scores.get("labial", 0.0)),
@@ -420,5 +455,5 @@ def analyze_nasal(wav_path: str, syllable: str) -> Dict[str, Any]:
             "final_score": float(final_score),
             "confidence": confidence,
         },
-        "feedback": {"text": feedback_text},
-    }
+        feedback_text=feedback_text,
+    )
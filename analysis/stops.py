@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Any
 
 import numpy as np
-import scipy.signal
 import parselmouth
 
 # ============================================================
@@ -45,6 +45,21 @@ PLACE_SIGMA_HZ = 700.0   # 넓게(=성별/개인차/측정오차 흡수)
 PLACE_CONF_MARGIN_EPS = 1e-9
 PLACE_LOW_CONF_THRESH = 0.20
 
+# same table as arrays, for scoring all places in one shot
+_PLACE_NAMES = tuple(PLACE_F2_CENTERS_HZ.keys())
+_PLACE_CENTERS = np.array([PLACE_F2_CENTERS_HZ[p] for p in _PLACE_NAMES], dtype=np.float64)
+
+# place scores precomputed on a 1 Hz F2 grid (rows follow _PLACE_NAMES);
+# F2 outside the grid falls back to the closed-form Gaussian
+_F2_GRID_LO, _F2_GRID_HI = 400, 3500
+_PLACE_LUT = 100.0 * np.exp(
+    -0.5 * ((np.arange(_F2_GRID_LO, _F2_GRID_HI + 1)[None, :] - _PLACE_CENTERS[:, None]) / PLACE_SIGMA_HZ) ** 2
+)
+# per-grid-point rows of plain floats: the scoring chain only ever touches
+# 3 scalars, where numpy's per-call overhead would dominate
+_PLACE_LUT_ROWS = _PLACE_LUT.T.tolist()
+_PLACE_CENTER_LIST = _PLACE_CENTERS.tolist()
+
 # --- VOT ranges (unified) ---
 VOT_RANGES_MS = {
     "fortis":    (0.0, 20.0, 10.0),
@@ -52,6 +67,10 @@ VOT_RANGES_MS = {
     "aspirated": (60.0, 100.0, 80.0),
 }
 VOT_SOFT_MARGIN_MS = 15.0
+# in-range scoring tolerance per phonation (half the range width), fixed at import
+_VOT_TOL_MS = {k: max((hi - lo) / 2.0, 1.0) for k, (lo, hi, _c) in VOT_RANGES_MS.items()}
+# pitch/HNR frame step for the voiced-onset search (2.5 ms << VOT_SOFT_MARGIN_MS)
+VOT_TIME_STEP_S = 0.0025
 
 # --- F0 z-score targets (speaker-normalized) ---
 F0Z_TARGETS = {
@@ -60,6 +79,11 @@ F0Z_TARGETS = {
     "aspirated": ( 0.6, 0.7),
 }
 
+# reference overlays for the frontend plots (input-independent, built once;
+# shared by every result like PLACE_F2_CENTERS_HZ -> treat as read-only)
+_VOT_REF_PLOT = {k: {"low": lo, "high": hi, "center": c} for k, (lo, hi, c) in VOT_RANGES_MS.items()}
+_F0Z_REF_PLOT = {k: {"center": c, "tol": tol} for k, (c, tol) in F0Z_TARGETS.items()}
+
 # --- Weighting ---
 PLACE_WEIGHT = 0.40
 PHONATION_WEIGHT = 0.60
@@ -70,25 +94,7 @@ VOT_BOUNDARY_NEAR_MS = 6.0
 
 
 # ============================================================
-# 2) Utility: audio loading and simple filters
-# ============================================================
-
-def load_sound(path: str) -> Tuple[parselmouth.Sound, np.ndarray, int]:
-    snd = parselmouth.Sound(path)
-    y = snd.values.T.flatten().astype(np.float64)
-    sr = int(round(snd.sampling_frequency))
-    return snd, y, sr
-
-def bandpass(sig: np.ndarray, sr: int, low: float, high: float, order: int = 4) -> np.ndarray:
-    nyq = sr / 2.0
-    lo = max(low / nyq, 0.0001)
-    hi = min(high / nyq, 0.9999)
-    b, a = scipy.signal.butter(order, [lo, hi], btype="band")
-    return scipy.signal.lfilter(b, a, sig)
-
-
-# ============================================================
-# 3) Feature extraction for stop
+# 2) Feature extraction for stop
 # ============================================================
 
 def detect_burst_time(snd: parselmouth.Sound) -> float:
@@ -101,73 +107,115 @@ def detect_burst_time(snd: parselmouth.Sound) -> float:
     if len(int_vals) == 0:
         return 0.0
     int_max = float(np.max(int_vals))
-    cands = np.where(int_vals > (int_max - 30.0))[0]
-    if cands.size == 0:
+    above = int_vals > (int_max - 30.0)
+    if not above.any():
         t = intensity.get_time_from_frame_number(1)
         return float(max(0.0, t))
-    idx = int(cands[0])
+    idx = int(above.argmax())  # first frame above threshold, no index array
     return float(intensity.get_time_from_frame_number(idx + 1))
 
-def estimate_vot_ms(snd: parselmouth.Sound, aspirated_mode: bool) -> Tuple[Optional[float], float, Optional[float]]:
+def _post_burst_tracks(
+    snd: parselmouth.Sound,
+    with_hnr: bool = True,
+    time_step: float = VOT_TIME_STEP_S,
+) -> Dict[str, Any]:
     """
-    Returns (vot_ms, burst_t, voiced_t).
-    - aspirated_mode=True uses a stricter criterion for voiced onset.
+    Burst time plus the F0 / HNR / intensity tracks of the 180 ms after it.
+    Empty tracks if the burst is at the very end of the file.
+    HNR (the costliest analysis) is only used by the aspirated criterion,
+    so with_hnr=False skips it and leaves an empty track.
     """
     burst_t = detect_burst_time(snd)
     end_t = min(burst_t + 0.18, snd.xmax)
     if end_t <= burst_t:
-        return None, burst_t, None
+        return {"burst_t": burst_t, "f0": np.array([])}
 
     snd_after = snd.extract_part(from_time=burst_t, to_time=end_t, preserve_times=False)
 
-    pitch = snd_after.to_pitch(time_step=0.001)
-    f0 = pitch.selected_array["frequency"]  # 0 if unvoiced
-    t_f0 = np.array([pitch.get_time_from_frame_number(i + 1) for i in range(len(f0))])
+    pitch = snd_after.to_pitch(time_step=time_step)
+    hnr, hnr_grid = np.array([]), (0.0, 1.0)
+    if with_hnr:
+        harm = snd_after.to_harmonicity_cc(time_step=time_step)
+        if harm is not None and harm.values is not None:
+            hnr, hnr_grid = harm.values[0], (float(harm.x1), float(harm.dx))
+    intensity = snd_after.to_intensity(minimum_pitch=100.0)
+    return {
+        "burst_t": burst_t,
+        "f0": pitch.selected_array["frequency"],  # 0 if unvoiced
+        "f0_grid": (float(pitch.x1), float(pitch.dx)),
+        "hnr": hnr,
+        "hnr_grid": hnr_grid,
+        "iv": intensity.values[0] if intensity is not None and len(intensity.values) > 0 else np.array([]),
+        "iv_grid": (float(intensity.x1), float(intensity.dx)),
+    }
+
 
-    harm = snd_after.to_harmonicity_cc(time_step=0.001)
-    hnr = harm.values[0] if harm is not None and harm.values is not None else np.array([])
-    t_hnr = np.array([harm.get_time_from_frame_number(i + 1) for i in range(len(hnr))]) if len(hnr) > 0 else np.array([])
+def _scan_voiced_onset(tracks: Dict[str, Any], aspirated_mode: bool) -> int:
+    """
+    Index of the voiced-onset F0 frame in _post_burst_tracks output, or -1.
+    Whole-array gates (no per-frame Python loop); falls back to the first
+    frame with a plausible F0 when no frame passes the HNR/intensity gate.
+    """
+    f0 = tracks["f0"]
+    if len(f0) == 0:
+        return -1
 
-    intensity = snd_after.to_intensity(minimum_pitch=100.0)
-    iv = intensity.values[0] if intensity is not None and len(intensity.values) > 0 else np.array([])
-    t_iv = np.array([intensity.get_time_from_frame_number(i + 1) for i in range(len(iv))]) if len(iv) > 0 else np.array([])
+    # uniform frame grid: x1 + k*dx (no per-frame Praat calls)
+    f0_x1, f0_dx = tracks["f0_grid"]
+    t_f0 = f0_x1 + np.arange(len(f0)) * f0_dx
+
+    hnr = tracks["hnr"]
+    iv = tracks["iv"]
     iv_max = float(np.max(iv)) if len(iv) > 0 else -200.0
 
-    voiced_rel = None
-    for i in range(len(f0)):
-        hz = float(f0[i])
-        if hz <= 70.0 or hz >= 400.0:
-            continue
-        tc = float(t_f0[i])
-
-        # Nearest HNR
-        hnr_db = -100.0
-        if len(t_hnr) > 0:
-            hi = int(np.argmin(np.abs(t_hnr - tc)))
-            hnr_db = float(hnr[hi])
-
-        # Nearest intensity
-        this_int = -200.0
-        if len(t_iv) > 0:
-            ii = int(np.argmin(np.abs(t_iv - tc)))
-            this_int = float(iv[ii])
-
-        if aspirated_mode:
-            # Clearer periodicity after aspiration
-            if (hnr_db > 5.0) and (this_int > (iv_max - 40.0)):
-                voiced_rel = tc
-                break
-        else:
-            # Lenis/fortis: allow earlier, weaker voicing
-            if this_int > (iv_max - 50.0):
-                voiced_rel = tc
-                break
+    # first F0 frame in the plausible range whose nearest HNR/intensity frames pass
+    # the gate (grids are uniform, so "nearest frame" is index math)
+    valid = (f0 > 70.0) & (f0 < 400.0)
+
+    hnr_at = np.full(len(f0), -100.0)
+    if len(hnr) > 0:
+        hnr_x1, hnr_dx = tracks["hnr_grid"]
+        hi = np.clip(np.round((t_f0 - hnr_x1) / hnr_dx).astype(int), 0, len(hnr) - 1)
+        hnr_at = hnr[hi]
+
+    int_at = np.full(len(f0), -200.0)
+    if len(iv) > 0:
+        iv_x1, iv_dx = tracks["iv_grid"]
+        ii = np.clip(np.round((t_f0 - iv_x1) / iv_dx).astype(int), 0, len(iv) - 1)
+        int_at = iv[ii]
+
+    if aspirated_mode:
+        # Clearer periodicity after aspiration
+        cond = valid & (hnr_at > 5.0) & (int_at > (iv_max - 40.0))
+    else:
+        # Lenis/fortis: allow earlier, weaker voicing
+        cond = valid & (int_at > (iv_max - 50.0))
+
+    if cond.any():
+        return int(np.argmax(cond))
+    if valid.any():
+        return int(np.argmax(valid))
+    return -1
+
+def estimate_vot_ms(
+    snd: parselmouth.Sound,
+    aspirated_mode: bool,
+    tracks: Optional[Dict[str, Any]] = None,
+) -> Tuple[Optional[float], float, Optional[float]]:
+    """
+    Returns (vot_ms, burst_t, voiced_t).
+    - aspirated_mode=True uses a stricter criterion for voiced onset.
+    - tracks: precomputed _post_burst_tracks(snd) (computed here if None).
+    """
+    if tracks is None:
+        tracks = _post_burst_tracks(snd, with_hnr=aspirated_mode)
+    burst_t = tracks["burst_t"]
 
-    if voiced_rel is None:
-        idx = np.where((f0 > 70.0) & (f0 < 400.0))[0]
-        if idx.size == 0:
-            return None, burst_t, None
-        voiced_rel = float(t_f0[int(idx[0])])
+    i = _scan_voiced_onset(tracks, aspirated_mode)
+    if i < 0:
+        return None, burst_t, None
+    f0_x1, f0_dx = tracks["f0_grid"]
+    voiced_rel = float(f0_x1 + i * f0_dx)
 
     voiced_t = float(burst_t + voiced_rel)
     vot_ms = max(0.0, (voiced_t - burst_t) * 1000.0)
@@ -187,7 +235,13 @@ def estimate_f2_onset_hz(
     t = voiced_t + offset_ms / 1000.0
     t = min(max(t, snd_full.xmin), snd_full.xmax)
 
-    formant = snd_full.to_formant_burg(
+    # Burg only on a short window around t (the 50 ms analysis window plus
+    # margin) instead of the whole utterance; times are preserved
+    t0 = max(snd_full.xmin, t - 0.05)
+    t1 = min(snd_full.xmax, t + 0.05)
+    seg = snd_full.extract_part(from_time=t0, to_time=t1, preserve_times=True)
+
+    formant = seg.to_formant_burg(
         time_step=0.005,
         max_number_of_formants=5,
         maximum_formant=max_formant
@@ -224,7 +278,7 @@ def estimate_vowel_onset_f0_hz(
 
 
 # ============================================================
-# 4) F0 calibration (speaker-normalized)
+# 3) F0 calibration (speaker-normalized)
 # ============================================================
 
 @dataclass
@@ -245,7 +299,7 @@ def compute_f0_z(f0_onset_hz: Optional[float], calib: Optional[F0Calibration]) -
 
 
 # ============================================================
-# 5) Scoring & classification helpers
+# 4) Scoring & classification helpers
 # ============================================================
 
 def gaussian_distance_score(value: float, center: float, sigma: float) -> float:
@@ -264,6 +318,23 @@ def linear_distance_score(value: float, center: float, tol: float) -> float:
     s = 100.0 * (1.0 - (d / tol))
     return float(max(0.0, min(100.0, s)))
 
+def _place_scores(f2_onset_hz: float) -> List[float]:
+    """
+    Gaussian place scores (0..100) for all places, ordered as _PLACE_NAMES.
+    Table lookup with linear interpolation inside the F2 grid.
+    """
+    x = f2_onset_hz - _F2_GRID_LO
+    if 0.0 <= x < (_F2_GRID_HI - _F2_GRID_LO):
+        i = int(x)
+        frac = x - i
+        w = 1.0 - frac
+        return [a * w + b * frac for a, b in zip(_PLACE_LUT_ROWS[i], _PLACE_LUT_ROWS[i + 1])]
+    out = []
+    for c in _PLACE_CENTER_LIST:
+        d = (f2_onset_hz - c) / PLACE_SIGMA_HZ
+        out.append(100.0 * math.exp(-0.5 * d * d))
+    return out
+
 def classify_place(f2_onset_hz: Optional[float]) -> str:
     if f2_onset_hz is None:
         return "unknown"
@@ -279,9 +350,8 @@ def classify_place(f2_onset_hz: Optional[float]) -> str:
 def compute_place_score(f2_onset_hz: Optional[float], target_place: str) -> Optional[float]:
     if f2_onset_hz is None or target_place not in PLACE_F2_CENTERS_HZ:
         return None
-    center = PLACE_F2_CENTERS_HZ[target_place]
-    #return linear_distance_score(f2_onset_hz, center, PLACE_TOLERANCE_HZ)
-    return gaussian_distance_score(f2_onset_hz, center, PLACE_SIGMA_HZ)
+    s = _place_scores(f2_onset_hz)[_PLACE_NAMES.index(target_place)]
+    return float(max(0.0, min(100.0, s)))
 
 def compute_place_softscores_and_confidence(f2_onset_hz: Optional[float]) -> Tuple[str, Optional[float], Dict[str, float]]:
     """
@@ -293,14 +363,19 @@ def compute_place_softscores_and_confidence(f2_onset_hz: Optional[float]) -> Tup
     if f2_onset_hz is None:
         return "unknown", None, {}
 
-    soft_scores: Dict[str, float] = {}
-    for place, c in PLACE_F2_CENTERS_HZ.items():
-        soft_scores[place] = gaussian_distance_score(f2_onset_hz, c, PLACE_SIGMA_HZ)
+    # all places at once (same Gaussian as gaussian_distance_score)
+    s = [max(0.0, min(100.0, v)) for v in _place_scores(f2_onset_hz)]
+    soft_scores: Dict[str, float] = dict(zip(_PLACE_NAMES, s))
 
-    # detected = highest score
-    sorted_places = sorted(soft_scores.items(), key=lambda kv: kv[1], reverse=True)
-    best_place, best_s = sorted_places[0]
-    second_s = sorted_places[1][1] if len(sorted_places) > 1 else 0.0
+    # best (first one on ties) and runner-up in one pass, no sorted list
+    i, best_s, second_s = 0, s[0], 0.0
+    for j in range(1, len(s)):
+        v = s[j]
+        if v > best_s:
+            i, best_s, second_s = j, v, best_s
+        elif v > second_s:
+            second_s = v
+    best_place = _PLACE_NAMES[i]
 
     # confidence: how clearly best beats second
     conf = (best_s - second_s) / (best_s + PLACE_CONF_MARGIN_EPS)
@@ -334,15 +409,15 @@ def classify_phonation_by_vot(vot_ms: Optional[float]) -> str:
 def compute_vot_score(vot_ms: Optional[float], target_phonation: str) -> Optional[float]:
     if vot_ms is None:
         return None
-    if target_phonation not in VOT_RANGES_MS:
+    rng = VOT_RANGES_MS.get(target_phonation)
+    if rng is None:
         return None
 
-    lo, hi, center = VOT_RANGES_MS[target_phonation]
+    lo, hi, center = rng
 
     # Inside the reference range: distance-based scoring toward the center
     if lo <= vot_ms <= hi:
-        tol = max((hi - lo) / 2.0, 1.0)
-        return linear_distance_score(vot_ms, center, tol)
+        return linear_distance_score(vot_ms, center, _VOT_TOL_MS[target_phonation])
 
     # Outside the reference range: decay with a soft margin
     d = (lo - vot_ms) if vot_ms < lo else (vot_ms - hi)
@@ -350,6 +425,7 @@ def compute_vot_score(vot_ms: Optional[float], target_phonation: str) -> Optiona
     return float(max(0.0, min(70.0, s)))
 
 F0Z_SIGMA = 0.8
+_F0Z_INV_2S2 = 1.0 / (2.0 * F0Z_SIGMA * F0Z_SIGMA)
 def compute_f0_score(f0_z: Optional[float], target_phonation: str) -> Optional[float]:
     """
     NOTE:
@@ -358,11 +434,14 @@ def compute_f0_score(f0_z: Optional[float], target_phonation: str) -> Optional[f
     """
     if f0_z is None:
         return None
-    if target_phonation not in F0Z_TARGETS:
+    target = F0Z_TARGETS.get(target_phonation)
+    if target is None:
         return None
-    center, tol = F0Z_TARGETS[target_phonation]
+    center, tol = target
     #return linear_distance_score(f0_z, center, tol)
-    return gaussian_distance_score(f0_z, center, F0Z_SIGMA)
+    # gaussian_distance_score(f0_z, center, F0Z_SIGMA) with the constant folded
+    d = f0_z - center
+    return float(min(100.0, 100.0 * math.exp(-(d * d) * _F0Z_INV_2S2)))
 
 def distance_to_nearest_boundary(vot_ms: Optional[float]) -> Optional[float]:
     if vot_ms is None:
@@ -372,7 +451,8 @@ def distance_to_nearest_boundary(vot_ms: Optional[float]) -> Optional[float]:
 def compute_phonation_score(
     vot_score: Optional[float],
     f0_score: Optional[float],
-    vot_ms: Optional[float]
+    vot_ms: Optional[float],
+    near_boundary_ms: Optional[float] = None,
 ) -> Optional[float]:
     """
     Primary cue: VOT
@@ -386,7 +466,7 @@ def compute_phonation_score(
     if f0_score is None:
         return vot_score
 
-    d = distance_to_nearest_boundary(vot_ms)
+    d = near_boundary_ms if near_boundary_ms is not None else distance_to_nearest_boundary(vot_ms)
     if d is None:
         w_f0 = 0.25
     else:
@@ -406,7 +486,7 @@ def compute_final_score(place_score: Optional[float], phonation_score: Optional[
 
 
 # ============================================================
-# 6) Feedback generation (short, backend-side)
+# 5) Feedback generation (short, backend-side)
 # ============================================================
 '''
 def generate_stop_feedback(
@@ -513,9 +593,6 @@ def generate_stop_feedback(
     # - If phonation is off, address that first (it drives perceived correctness).
     # - Praise should be specific ("lip position is good"), not global ("good job").
 
-    # -------------------------
-    # Place hint (mouth/tongue position)
-    # -------------------------
     # --- Guard: if we couldn't measure anything, don't praise ---
     # If both main subscores are missing, analysis likely failed (no clear burst/voicing).
     if place_score is None and phonation_score is None:
@@ -524,6 +601,20 @@ def generate_stop_feedback(
             "Please record again."
         )
 
+    # The text only depends on the categorical outcome, so it is memoized on that
+    low_conf = place_confidence is not None and place_confidence < PLACE_LOW_CONF_THRESH
+    return _stop_feedback_text(target_place, detected_place, target_phonation, detected_phonation, low_conf)
+
+
+@lru_cache(maxsize=512)  # whole key space is 3*4*3*5*2 = 360
+def _stop_feedback_text(
+    target_place: str, detected_place: str,
+    target_phonation: str, detected_phonation: str,
+    low_conf: bool,
+) -> str:
+    # -------------------------
+    # Place hint (mouth/tongue position)
+    # -------------------------
     place_hint = ""
 
     if detected_place != "unknown" and detected_place != target_place:
@@ -536,7 +627,7 @@ def generate_stop_feedback(
             place_hint = "Close your lips firmly, then release smoothly."
     else:
         # Place is basically right → refine only if cue is weak
-        if place_confidence is not None and place_confidence < PLACE_LOW_CONF_THRESH:
+        if low_conf:
             if target_place == "velar":
                 place_hint = "Almost there. Press the back of your tongue a bit more firmly, then release."
             elif target_place == "alveolar":
@@ -583,17 +674,6 @@ def generate_stop_feedback(
                 "Release with a clear puff of breath, then start the voice."
             )
 
-    # -------------------------
-    # Score string (optional)
-    # -------------------------
-    parts = []
-    if place_score is not None:
-        parts.append(f"place {place_score:.0f}")
-    if phonation_score is not None:
-        parts.append(f"phonation {phonation_score:.0f}")
-    score_str = ", ".join(parts) if parts else "score N/A"
-    base = f"({score_str}) "
-
     # -------------------------
     # Combine: prioritize phonation if it's the main error
     # -------------------------
@@ -607,7 +687,7 @@ def generate_stop_feedback(
     return "Good overall. Try to repeat the same feeling again."
 
 # ============================================================
-# 7) Core: evaluate_stop
+# 6) Core: evaluate_stop
 # ============================================================
 
 def evaluate_stop(
@@ -622,13 +702,16 @@ def evaluate_stop(
     #place_score = compute_place_score(f2_onset_hz, target_place)
 
     detected_place, place_conf, place_softscores = compute_place_softscores_and_confidence(f2_onset_hz)
-    place_score = compute_place_score(f2_onset_hz, target_place)
+    # same clamped Gaussian as compute_place_score(f2_onset_hz, target_place);
+    # None when F2 is missing (empty dict) or the place is unknown
+    place_score = place_softscores.get(target_place)
 
     detected_phonation = classify_phonation_by_vot(vot_ms)
     vot_sc = compute_vot_score(vot_ms, target_phonation)
 
     f0_sc = compute_f0_score(f0_z, target_phonation)
-    phonation_sc = compute_phonation_score(vot_sc, f0_sc, vot_ms)
+    near_ms = distance_to_nearest_boundary(vot_ms)
+    phonation_sc = compute_phonation_score(vot_sc, f0_sc, vot_ms, near_boundary_ms=near_ms)
 
     final_sc = compute_final_score(place_score, phonation_sc)
     vot_diag = vot_status(vot_ms)
@@ -645,27 +728,21 @@ def evaluate_stop(
         "final_score": final_sc,
         "diagnostics": {
             "vot_status": vot_diag,
-            "near_boundary_ms": distance_to_nearest_boundary(vot_ms),
+            "near_boundary_ms": near_ms,
         },
         "plots": {
             "f2_centers_hz": PLACE_F2_CENTERS_HZ,
             "f2_tolerance_hz": PLACE_TOLERANCE_HZ,
             "f2_user_hz": f2_onset_hz,
             "vot_f0_point": {"x_vot_ms": vot_ms, "y_f0_z": f0_z},
-            "vot_reference_ranges_ms": {
-                k: {"low": lo, "high": hi, "center": c}
-                for k, (lo, hi, c) in VOT_RANGES_MS.items()
-            },
-            "f0z_reference_targets": {
-                k: {"center": F0Z_TARGETS[k][0], "tol": F0Z_TARGETS[k][1]}
-                for k in F0Z_TARGETS
-            },
+            "vot_reference_ranges_ms": _VOT_REF_PLOT,
+            "f0z_reference_targets": _F0Z_REF_PLOT,
         }
     }
 
 
 # ============================================================
-# 8) End-to-end stop analysis
+# 7) End-to-end stop analysis
 # ============================================================
 
 def analyze_stop(wav_path: str, syllable: str, f0_calibration: Optional[F0Calibration] = None) -> Dict[str, Any]:
@@ -675,7 +752,7 @@ def analyze_stop(wav_path: str, syllable: str, f0_calibration: Optional[F0Calibr
     target_place = STOP_META[syllable]["place"]
     target_phonation = STOP_META[syllable]["phonation"]
 
-    snd, y, sr = load_sound(wav_path)
+    snd = parselmouth.Sound(wav_path)
 
     aspirated_mode = (target_phonation == "aspirated")
     vot_ms, burst_t, voiced_t = estimate_vot_ms(snd, aspirated_mode=aspirated_mode)
@@ -2,15 +2,22 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import hashlib
+import io
 import os
 import subprocess
-import tempfile
-import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import parselmouth
+from scipy.ndimage import median_filter
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
 from matplotlib.patches import Ellipse
 
 # Korean font (helps render labels cleanly when available)
@@ -19,6 +26,9 @@ try:
 except Exception:
     pass
 
+# Reference-vowel label font, resolved once instead of per label per plot
+_REF_LABEL_FONT = FontProperties(size=8)
+
 #########################################
 # 1. Reference Formant Tables           #
 #########################################
@@ -87,6 +97,54 @@ STANDARD_FEMALE_FORMANTS = {
     'ui (의)':  {'f1': 340, 'f2': 2100, 'f3': 3050, 'f1_sd':  50, 'f2_sd': 165},
 }
 
+# Column layout of the array form of a reference table (one row per vowel)
+_REF_COLS = ("f1", "f2", "f3")
+
+def _build_ref_arrays(ref_table):
+    """
+    Struct-of-arrays view of a formant table: (vowel keys, key -> row, (n, 3) float64).
+    Missing f3 is NaN.
+    """
+    keys = list(ref_table)
+    arr = np.array([
+        [ref["f1"], ref["f2"], ref.get("f3", np.nan)]
+        for ref in ref_table.values()
+    ], dtype=np.float64).reshape(len(keys), len(_REF_COLS))
+    return keys, {k: i for i, k in enumerate(keys)}, arr
+
+_MALE_REF_ARRAYS = _build_ref_arrays(STANDARD_MALE_FORMANTS)
+_FEMALE_REF_ARRAYS = _build_ref_arrays(STANDARD_FEMALE_FORMANTS)
+
+def _ref_arrays(ref_table):
+    # standard tables are converted once at import; custom (per-user) tables on demand
+    if ref_table is STANDARD_MALE_FORMANTS:
+        return _MALE_REF_ARRAYS
+    if ref_table is STANDARD_FEMALE_FORMANTS:
+        return _FEMALE_REF_ARRAYS
+    return _build_ref_arrays(ref_table)
+
+def _build_inv_sd(ref_table):
+    """
+    Reciprocal spreads per vowel: key -> (1/f1_sd, 1/f2_sd, 1/f3_sd).
+    f3_sd defaults to 250 Hz when the table does not provide one.
+    """
+    return {
+        k: (1.0 / ref["f1_sd"], 1.0 / ref["f2_sd"], 1.0 / ref.get("f3_sd", 250.0))
+        for k, ref in ref_table.items()
+    }
+
+_MALE_INV_SD = _build_inv_sd(STANDARD_MALE_FORMANTS)
+_FEMALE_INV_SD = _build_inv_sd(STANDARD_FEMALE_FORMANTS)
+
+def _inv_sd(ref_table, vowel_key):
+    # same split as _ref_arrays: standard tables precomputed, custom ones per call
+    if ref_table is STANDARD_MALE_FORMANTS:
+        return _MALE_INV_SD[vowel_key]
+    if ref_table is STANDARD_FEMALE_FORMANTS:
+        return _FEMALE_INV_SD[vowel_key]
+    ref = ref_table[vowel_key]
+    return 1.0 / ref["f1_sd"], 1.0 / ref["f2_sd"], 1.0 / ref.get("f3_sd", 250.0)
+
 # Import gender threshold from config
 try:
     from .config import F0_GENDER_THRESHOLD
@@ -117,6 +175,40 @@ def convert_to_wav(input_file: str, output_file: str) -> bool:
         return False
 
 
+# Vowel analysis never looks above maximum_formant=5500 Hz, so 16 kHz
+# (Nyquist 8 kHz) carries everything it uses at ~1/2.76 of the 44.1 kHz data
+ANALYSIS_SAMPLE_RATE = 16000
+
+
+def decode_audio(input_file: str, sample_rate: int = ANALYSIS_SAMPLE_RATE):
+    """
+    Decode any ffmpeg-readable file to a mono parselmouth.Sound in memory.
+    ffmpeg writes raw s16le PCM to a pipe, so there is no wav encode and no
+    temp-file round trip. Returns None on failure.
+    """
+    try:
+        proc = subprocess.run(
+            [
+                "ffmpeg", "-i", input_file,
+                "-ac", "1",
+                "-ar", str(sample_rate),
+                "-f", "s16le",
+                "pipe:1"
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+    except Exception as e:
+        print(f"[decode_audio] Error: {e}")
+        return None
+
+    pcm = np.frombuffer(proc.stdout, dtype="<i2")
+    if pcm.size == 0:
+        return None
+    return parselmouth.Sound(pcm / 32768.0, sampling_frequency=sample_rate)
+
+
 ###############################################
 # 3. Extract a stable window (~0.12s with strong RMS)
 ###############################################
@@ -134,21 +226,31 @@ def _stable_window(sound: parselmouth.Sound, min_len=0.12):
         # If the audio is too short, use the entire clip
         return sound, 0.01, 0.005, 999.0, duration
 
-    rms_list = []
     hop = max(win_size // 4, 1)
-    for start_idx in range(0, len(snd_values) - win_size + 1, hop):
-        seg = snd_values[start_idx:start_idx+win_size]
-        rms = float(np.sqrt(np.mean(seg**2)))
-        rms_list.append((rms, start_idx))
-
-    if not rms_list:
+    n_win = (len(snd_values) - win_size) // hop + 1
+    if n_win <= 0:
         return sound, 0.01, 0.005, 999.0, duration
 
-    # Pick the window with the highest energy
-    rms_list.sort(key=lambda x: x[0], reverse=True)
-    best_rms, best_idx = rms_list[0]
-
-    noise_floor = float(np.median([r for r, _ in rms_list]))
+    # Window energies from a prefix sum over hop-sized blocks: each sample is
+    # squared once (not once per overlapping window). A window starting at
+    # block k covers blocks k..k+q-1 plus r leftover samples.
+    q, r = divmod(win_size, hop)
+    n_blk = n_win - 1 + q
+    blk = snd_values[:n_blk * hop].reshape(n_blk, hop)
+    cs = np.zeros(n_blk + 1)
+    np.cumsum(np.einsum("ij,ij->i", blk, blk), out=cs[1:])
+    k = np.arange(n_win)
+    sums = cs[k + q] - cs[k]
+    if r:
+        tail = snd_values[(k + q)[:, None] * hop + np.arange(r)]
+        sums += np.einsum("ij,ij->i", tail, tail)
+    rms = np.sqrt(np.maximum(sums, 0.0) / win_size)
+
+    # Pick the window with the highest energy (earliest on ties)
+    best = int(np.argmax(rms))
+    best_rms, best_idx = float(rms[best]), best * hop
+
+    noise_floor = float(np.median(rms))
     snr_ratio = (best_rms + 1e-9) / (noise_floor + 1e-9)
 
     start_t = best_idx / sr
@@ -162,13 +264,37 @@ def _stable_window(sound: parselmouth.Sound, min_len=0.12):
 ###############################################
 # 4. Formant & pitch extraction
 ###############################################
-def analyze_vowel_and_pitch(wav_file_path: str):
+def _formant_tracks(formant, n_formants=3, times=None):
+    """
+    Formant values as a (n_formants, n_times) float32 array (NaN where
+    undefined), sampled at `times` (default: the frame centres from formant.xs()).
+    float32 keeps ~0.0003 Hz at 5 kHz, far below Burg's own error.
+    get_value_at_time on a frame centre is a direct (C-level) read.
+    Note: praat.call("To Matrix") / "Down to Table" are slower here, their
+    per-call overhead dwarfs the ~12 frames of the 0.12 s stable window
+    (and the Table export alone costs more than this read on ~150 frames).
+    """
+    xs = (formant.xs() if times is None else np.asarray(times, dtype=np.float64)).tolist()
+    n = len(xs)
+    value_at = formant.get_value_at_time
+    tracks = np.empty((n_formants, n), dtype=np.float32)
+    for k in range(n_formants):
+        # map + fromiter(count=n): filled straight into the preallocated row
+        tracks[k] = np.fromiter(map(value_at, [k + 1] * n, xs), dtype=np.float32, count=n)
+    return tracks
+
+
+def analyze_vowel_and_pitch(wav_file_path):
     """
+    wav_file_path: path to a wav file, or an already loaded parselmouth.Sound
     return:
         f1_mean, f2_mean, f3_mean, f0_mean, quality_hint
     """
     try:
-        snd_full = parselmouth.Sound(wav_file_path)
+        if isinstance(wav_file_path, parselmouth.Sound):
+            snd_full = wav_file_path
+        else:
+            snd_full = parselmouth.Sound(wav_file_path)
         full_dur = snd_full.get_total_duration()
 
         if full_dur < 0.2:
@@ -187,20 +313,25 @@ def analyze_vowel_and_pitch(wav_file_path: str):
         if snr_ratio < 1.5:
             quality_msgs.append("Background noise high; quieter place please.")
 
+        # Burg resamples to 2 * maximum_formant internally; do that once up front
+        # and run pitch on the same 11 kHz buffer (formants are unchanged, and
+        # 11 kHz is far above what a 500 Hz pitch ceiling needs)
+        stable = stable.resample(2 * 5500.0)
+
         # pitch → f0
         pitch = stable.to_pitch(pitch_floor=75.0, pitch_ceiling=500.0)
         pitch_values = pitch.selected_array["frequency"]
-        voiced = [f for f in pitch_values if f > 0]
-        f0_mean = float(np.mean(voiced)) if voiced else np.nan
+        voiced = pitch_values[pitch_values > 0]
+        if voiced.size:
+            # 5-frame median filter (edges replicated) knocks out isolated
+            # octave jumps (halving/doubling) before aggregating
+            f0_mean = float(np.median(median_filter(voiced, size=5, mode="nearest")))
+        else:
+            f0_mean = np.nan
 
         # formants via Burg
         formant = stable.to_formant_burg(maximum_formant=5500.0)
-        f1_vals, f2_vals, f3_vals = [], [], []
-        for frame_idx in range(1, formant.n_frames + 1):
-            t = formant.get_time_from_frame_number(frame_idx)
-            f1_vals.append(formant.get_value_at_time(1, t))
-            f2_vals.append(formant.get_value_at_time(2, t))
-            f3_vals.append(formant.get_value_at_time(3, t))
+        f1_vals, f2_vals, f3_vals = _formant_tracks(formant, 3)
 
         f1_mean = float(np.nanmedian(f1_vals))
         f2_mean = float(np.nanmedian(f2_vals))
@@ -208,7 +339,7 @@ def analyze_vowel_and_pitch(wav_file_path: str):
 
         print(f"[analyze_vowel_and_pitch] f0={f0_mean:.1f}, f1={f1_mean:.1f}, f2={f2_mean:.1f}, f3={f3_mean:.1f}")
 
-        if any(np.isnan(v) for v in [f0_mean, f1_mean, f2_mean]):
+        if not np.isfinite([f0_mean, f1_mean, f2_mean]).all():
             print(f"[analyze_vowel_and_pitch] NaN detected - f0_nan={np.isnan(f0_mean)}, f1_nan={np.isnan(f1_mean)}, f2_nan={np.isnan(f2_mean)}")
             return None, None, None, None, "Could not get stable formants. Try a clearer vowel."
 
@@ -224,46 +355,50 @@ def analyze_vowel_and_pitch(wav_file_path: str):
 ###############################################
 def compute_score(f1, f2, f3, vowel_key, ref_table):
     std = ref_table[vowel_key]
-    f1_z = abs(f1 - std["f1"]) / std["f1_sd"]
-    f2_z = abs(f2 - std["f2"]) / std["f2_sd"]
+    inv_f1_sd, inv_f2_sd, inv_f3_sd = _inv_sd(ref_table, vowel_key)
+    f1_z = abs(f1 - std["f1"]) * inv_f1_sd
+    f2_z = abs(f2 - std["f2"]) * inv_f2_sd
     z_avg = (f1_z + f2_z) / 2.0
 
     # Give F3 a stronger weight (default sigma 250 Hz when not provided)
     if "f3" in std and f3:
-        f3_sd = std.get("f3_sd", 250.0)
-        f3_z = abs(f3 - std["f3"]) / f3_sd
+        f3_z = abs(f3 - std["f3"]) * inv_f3_sd
         z_avg = (z_avg * 0.75) + (f3_z * 0.25)
 
     if z_avg <= 1.5:
         return 100
 
-    penalty = (z_avg - 1.5) * 60.0
-    raw_score = 100.0 - penalty
-    return int(max(0, min(100, raw_score)))
+    # Past 1.5 sigma the score only drops from 100, so a single clamp at 0 is enough
+    raw_score = 100.0 - (z_avg - 1.5) * 60.0
+    return int(raw_score) if raw_score > 0 else 0
 
 
 ###############################################
 # 6. Feedback generation
 ###############################################
+# Articulation hints indexed by [formant][direction + 1], direction in {-1, 0, +1}
+_FEEDBACK_TABLE = (
+    # High F1 → mouth too open / tongue too low
+    ("Mouth too closed / tongue too high → lower tongue slightly.",
+     None,
+     "Mouth too open / tongue too low → raise tongue slightly."),
+    # High F2 → tongue too far forward
+    ("Tongue too back → move it slightly forward.",
+     None,
+     "Tongue too front → pull it slightly back."),
+)
+
 def get_feedback(vowel_key, f1, f2, ref_table, quality_hint=None):
     std = ref_table[vowel_key]
-    msgs = []
 
     f1_tol = std["f1_sd"] * 0.5
     f2_tol = std["f2_sd"] * 0.5
 
-    # High F1 → mouth too open / tongue too low
-    if f1 > std["f1"] + f1_tol:
-        msgs.append("Mouth too open / tongue too low → raise tongue slightly.")
-    elif f1 < std["f1"] - f1_tol:
-        msgs.append("Mouth too closed / tongue too high → lower tongue slightly.")
-
-    # High F2 → tongue too far forward
-    if f2 > std["f2"] + f2_tol:
-        msgs.append("Tongue too front → pull it slightly back.")
-    elif f2 < std["f2"] - f2_tol:
-        msgs.append("Tongue too back → move it slightly forward.")
+    # -1 below the tolerance band, +1 above it, 0 inside
+    f1_dir = int(f1 > std["f1"] + f1_tol) - int(f1 < std["f1"] - f1_tol)
+    f2_dir = int(f2 > std["f2"] + f2_tol) - int(f2 < std["f2"] - f2_tol)
 
+    msgs = [m for m in (_FEEDBACK_TABLE[0][f1_dir + 1], _FEEDBACK_TABLE[1][f2_dir + 1]) if m]
     if not msgs:
         msgs = ["Excellent! 👏 Very close to the target placement."]
 
@@ -276,17 +411,51 @@ def get_feedback(vowel_key, f1, f2, ref_table, quality_hint=None):
 ###############################################
 # 7. High-level: analyze a single sample
 ###############################################
+# (f1, f2, f3, f0, quality_hint) per recording, keyed by a hash of the file
+# bytes: uploads land under fresh temp names, so path/mtime keys never hit
+_MEASURE_CACHE = OrderedDict()
+_MEASURE_CACHE_SIZE = 128
+_MEASURE_CACHE_LOCK = threading.Lock()
+
+def _audio_digest(audio_path):
+    """
+    (size in bytes, content digest) from a single open + read of the file;
+    None if it is missing or unreadable.
+    """
+    try:
+        with open(audio_path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        return None
+    return len(data), hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _measure_cache_get(digest):
+    with _MEASURE_CACHE_LOCK:
+        measures = _MEASURE_CACHE.get(digest)
+        if measures is not None:
+            _MEASURE_CACHE.move_to_end(digest)
+        return measures
+
+def _measure_cache_put(digest, measures):
+    with _MEASURE_CACHE_LOCK:
+        _MEASURE_CACHE[digest] = measures
+        _MEASURE_CACHE.move_to_end(digest)
+        while len(_MEASURE_CACHE) > _MEASURE_CACHE_SIZE:
+            _MEASURE_CACHE.popitem(last=False)
+
+
 def analyze_single_audio(
     audio_path: str,
     vowel_key: str,
     *,
     return_reason: bool = False,
-    custom_ref_table: dict = None
+    custom_ref_table: dict = None,
+    decoded: parselmouth.Sound = None
 ):
     """
     Analyze vowel formants from audio file.
 
-    1) Convert with ffmpeg
+    1) Decode with ffmpeg (in memory)
     2) Extract F0/F1/F2/F3 from the stable window
     3) Guess gender and pull the matching reference table (or use custom_ref_table)
     4) Return scores and feedback as a dictionary
@@ -296,52 +465,41 @@ def analyze_single_audio(
         vowel_key: Vowel identifier (e.g., 'a (아)')
         return_reason: If True, return (result, error) tuple
         custom_ref_table: Optional personalized reference table (overrides standard)
+        decoded: Optional already-decoded audio (skips the ffmpeg step);
+            _DECODE_FAILED reports an earlier failed decode without retrying it
 
     Returns:
         Analysis result dict or (None, error_msg) if return_reason=True
     """
-    if not os.path.exists(audio_path):
+    # One read gives existence, size and the content digest (no separate stat calls)
+    info = _audio_digest(audio_path)
+    if info is None:
         msg = "Audio file not found."
         if return_reason:
             return None, msg
         return None
+    original_size, digest = info
 
-    try:
-        original_size = os.path.getsize(audio_path)
-    except OSError:
-        original_size = -1
+    # Same recording scored again (retry, another vowel key, upload re-sent under
+    # a new temp name): reuse the measurements and skip ffmpeg + Praat entirely
+    measures = _measure_cache_get(digest)
 
-    # Create unique temporary file to avoid race conditions
-    tmp_wav = os.path.join(tempfile.gettempdir(), f"kospa_temp_{uuid.uuid4().hex}.wav")
+    if measures is None:
+        # Decode straight into memory (no intermediate wav on disk)
+        snd = decoded if decoded is not None else decode_audio(audio_path)
+        if snd is None or snd is _DECODE_FAILED:
+            msg = f"Failed to convert input audio (size={original_size})."
+            print(f"[analyze_single_audio] {msg}")
+            if return_reason:
+                return None, msg
+            return None
 
-    if not convert_to_wav(audio_path, tmp_wav):
-        msg = f"Failed to convert input audio (size={original_size})."
-        print(f"[analyze_single_audio] {msg}")
-        if return_reason:
-            return None, msg
-        return None
-
-    try:
-        wav_size = os.path.getsize(tmp_wav)
-    except OSError:
-        wav_size = -1
-
-    # Check audio duration
-    try:
-        snd = parselmouth.Sound(tmp_wav)
-        audio_duration = snd.get_total_duration()
-    except Exception:
-        audio_duration = -1
+        print(f"[analyze_single_audio] Decoded input={original_size} bytes, duration={snd.get_total_duration():.2f}s")
 
-    print(f"[analyze_single_audio] Converted sizes input={original_size}, wav={wav_size}, duration={audio_duration:.2f}s")
+        measures = analyze_vowel_and_pitch(snd)
+        _measure_cache_put(digest, measures)
 
-    f1, f2, f3, f0, qhint = analyze_vowel_and_pitch(tmp_wav)
-
-    # Clean up temporary file
-    try:
-        os.remove(tmp_wav)
-    except OSError:
-        pass
+    f1, f2, f3, f0, qhint = measures
 
     if f1 is None or f2 is None or f0 is None:
         msg = qhint or "Could not extract stable formants."
@@ -385,22 +543,89 @@ def analyze_single_audio(
     return result
 
 
+# marks a batch item whose decode already failed, so it is not decoded again
+_DECODE_FAILED = object()
+
+
+def _decode_item(item):
+    audio_path, _ = item
+    if not os.path.exists(audio_path):
+        return None
+    snd = decode_audio(audio_path)
+    return _DECODE_FAILED if snd is None else snd
+
+
+def analyze_vowels_batch(items, custom_ref_table=None, workers=None):
+    """
+    analyze_single_audio over many (audio_path, vowel_key) pairs (results in input order).
+    ffmpeg decodes are the slow stage and run as subprocesses from a thread
+    pool, so they overlap each other and the Praat analysis (~2 ms per clip),
+    which runs here as soon as each decode lands.
+    Not called by the API routes (they grade one upload per request); meant
+    for offline grading of recorded sets.
+    """
+    items = [(str(p), k) for p, k in items]
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return [
+            analyze_single_audio(p, k, custom_ref_table=custom_ref_table, decoded=snd)
+            for (p, k), snd in zip(items, ex.map(_decode_item, items))
+        ]
+
+
 ###############################################
 # 8. (Optional) visualize a single vowel
 ###############################################
-def plot_single_vowel_space(f1, f2, vowel_key, gender_guess, out_path):
+_VOWEL_PLOT_LOCK = threading.Lock()
+_vowel_plot_bases = {}
+_target_ellipses = {}
+
+def _vowel_plot_base(gender_guess):
+    """
+    Figure with the static layer for one gender (reference markers + labels,
+    axis labels, inverted axes, grid). Built once and reused for every plot;
+    callers must hold _VOWEL_PLOT_LOCK.
+    """
+    base = _vowel_plot_bases.get(gender_guess)
+    if base is not None:
+        return base
+
     ref_table = STANDARD_MALE_FORMANTS if gender_guess == "Male" else STANDARD_FEMALE_FORMANTS
-    tgt = ref_table[vowel_key]
+    # plain Figure (no pyplot registry): lives for the whole process
+    fig = Figure(figsize=(6, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    # Reference vowels: one scatter collection for all markers (columns of the
+    # array table), labels share one font
+    keys, _, arr = _ref_arrays(ref_table)
+    ref_f1, ref_f2 = arr[:, 0], arr[:, 1]
+    ax.scatter(ref_f2, ref_f1, c="lightgray", marker="x", s=60, zorder=2)
+    for k, x, y in zip(keys, ref_f2.tolist(), ref_f1.tolist()):
+        ax.text(x + 10, y + 10, k, color="gray", fontproperties=_REF_LABEL_FONT)
+
+    ax.set_xlabel("F2 (Hz) ← front ... back →")
+    ax.set_ylabel("F1 (Hz) ← high ... low →")
+    ax.invert_yaxis()
+    ax.invert_xaxis()
+    ax.grid(True, linestyle="--", alpha=0.5)
+
+    # reference-layer data limits and the untouched subplot params, restored per plot
+    subplot_params = {k: getattr(fig.subplotpars, k) for k in ("left", "bottom", "right", "top", "wspace", "hspace")}
+    base = (fig, ax, ax.dataLim.get_points().copy(), subplot_params)
+    _vowel_plot_bases[gender_guess] = base
+    return base
 
-    fig, ax = plt.subplots(figsize=(6, 5))
 
-    # Reference vowels
-    for k, ref in ref_table.items():
-        ax.scatter(ref["f2"], ref["f1"], c="lightgray", marker="x", s=60, zorder=2)
-        ax.text(ref["f2"]+10, ref["f1"]+10, k, color="gray", fontsize=8)
+def _target_ellipse_patches(gender_guess, vowel_key, tgt):
+    """
+    The 1σ / 2σ ellipses of one target vowel. They only depend on the
+    reference table, so each pair is built once and re-added to the reused
+    axes (removed patches can be added back); callers must hold _VOWEL_PLOT_LOCK.
+    """
+    patches = _target_ellipses.get((gender_guess, vowel_key))
+    if patches is not None:
+        return patches
 
-    # Target vowel
-    ax.scatter(tgt["f2"], tgt["f1"], c="green", s=200, alpha=0.7, label=f"Target {vowel_key}")
     ellipse = Ellipse(
         (tgt["f2"], tgt["f1"]),
         width=tgt["f2_sd"] * 2.0,
@@ -410,8 +635,6 @@ def plot_single_vowel_space(f1, f2, vowel_key, gender_guess, out_path):
         alpha=0.18,
         label="Target 1σ"
     )
-    ax.add_patch(ellipse)
-
     ellipse_2 = Ellipse(
         (tgt["f2"], tgt["f1"]),
         width=tgt["f2_sd"] * 4.0,
@@ -423,22 +646,45 @@ def plot_single_vowel_space(f1, f2, vowel_key, gender_guess, out_path):
         linewidth=1.0,
         label="Target 2σ"
     )
-    ax.add_patch(ellipse_2)
+    patches = _target_ellipses[(gender_guess, vowel_key)] = (ellipse, ellipse_2)
+    return patches
 
-    # Measured point
-    ax.scatter(f2, f1, c="red", s=200, alpha=0.8, label="You")
 
-    ax.set_title(f"{vowel_key} / gender={gender_guess}")
-    ax.set_xlabel("F2 (Hz) ← front ... back →")
-    ax.set_ylabel("F1 (Hz) ← high ... low →")
-    ax.invert_yaxis()
-    ax.invert_xaxis()
-    ax.grid(True, linestyle="--", alpha=0.5)
-    ax.legend(fontsize=8, loc="best")
+def plot_single_vowel_space(f1, f2, vowel_key, gender_guess, out_path):
+    ref_table = STANDARD_MALE_FORMANTS if gender_guess == "Male" else STANDARD_FEMALE_FORMANTS
+    tgt = ref_table[vowel_key]
 
-    plt.tight_layout()
-    plt.savefig(out_path)
-    plt.close(fig)
+    with _VOWEL_PLOT_LOCK:
+        fig, ax, ref_lim, subplot_params = _vowel_plot_base(gender_guess)
+        # limits start from the reference layer only, then grow with this plot's artists
+        # (copy: the Bbox updates its points array in place)
+        ax.dataLim.set_points(ref_lim.copy())
+        fig.subplots_adjust(**subplot_params)
+
+        # Target vowel
+        dynamic = [ax.scatter(tgt["f2"], tgt["f1"], c="green", s=200, alpha=0.7, label=f"Target {vowel_key}")]
+        ellipse, ellipse_2 = _target_ellipse_patches(gender_guess, vowel_key, tgt)
+        dynamic.append(ax.add_patch(ellipse))
+        dynamic.append(ax.add_patch(ellipse_2))
+
+        # Measured point
+        dynamic.append(ax.scatter(f2, f1, c="red", s=200, alpha=0.8, label="You"))
+
+        ax.set_title(f"{vowel_key} / gender={gender_guess}")
+        ax.autoscale_view()
+        legend = ax.legend(fontsize=8, loc="best")
+
+        try:
+            fig.tight_layout()
+            # tight_layout leaves a placeholder layout engine behind, which
+            # makes savefig run a whole extra layout draw; the layout is done
+            fig.set_layout_engine(None)
+            fig.savefig(out_path)
+        finally:
+            # back to the static layer for the next request
+            legend.remove()
+            for artist in dynamic:
+                artist.remove()
 
 
 ###############################################
@@ -496,6 +742,10 @@ def downsample_trajectory(trajectory: list, target_frames: int = 10) -> list:
     return [trajectory[i] for i in indices]
 
 
+# Containers Praat opens itself, no ffmpeg needed (compared case-insensitively)
+_PRAAT_NATIVE_SUFFIXES = ('.wav', '.wave', '.aif', '.aiff', '.aifc', '.flac')
+
+
 def extract_formant_trajectory(
     wav_file_path: str,
     window_length: float = 0.025,  # 25ms window
@@ -529,20 +779,25 @@ def extract_formant_trajectory(
         >>> for frame in result['trajectory']:
         ...     print(f"t={frame['time']:.3f}s: F1={frame['f1']:.0f}, F2={frame['f2']:.0f}")
     """
-    # Convert to WAV if needed
-    if not wav_file_path.lower().endswith('.wav'):
-        temp_wav = tempfile.NamedTemporaryFile(delete=False, suffix='.wav').name
-        if not convert_to_wav(wav_file_path, temp_wav):
+    # Formats Praat reads natively are loaded directly; anything else (or a
+    # file Praat rejects) is decoded in memory by ffmpeg (no temp WAV)
+    sound = None
+    if wav_file_path.lower().endswith(_PRAAT_NATIVE_SUFFIXES):
+        try:
+            sound = parselmouth.Sound(wav_file_path)
+        except Exception:
+            pass
+    if sound is None:
+        sound = decode_audio(wav_file_path)
+        if sound is None:
             return {
                 'success': False,
                 'error': 'Failed to convert audio to WAV',
                 'trajectory': [],
                 'duration': 0
             }
-        wav_file_path = temp_wav
 
     try:
-        sound = parselmouth.Sound(wav_file_path)
         duration = sound.duration
 
         if duration < window_length:
@@ -571,28 +826,21 @@ def extract_formant_trajectory(
                 'duration': duration
             }
 
-        trajectory = []
-
-        for i in range(num_frames):
-            t_center = window_length / 2 + i * hop_length
-
-            try:
-                f1 = formants.get_value_at_time(1, t_center)
-                f2 = formants.get_value_at_time(2, t_center)
-                f3 = formants.get_value_at_time(3, t_center)
-
-                # Filter out NaN/undefined values and unrealistic values
-                if (f1 and not np.isnan(f1) and f2 and not np.isnan(f2) and
-                    150 < f1 < 1200 and 400 < f2 < 3500):  # Realistic formant ranges
-                    trajectory.append({
-                        'time': t_center,
-                        'f1': float(f1),
-                        'f2': float(f2),
-                        'f3': float(f3) if f3 and not np.isnan(f3) else 2500.0
-                    })
-            except Exception:
-                # Skip problematic frames
-                continue
+        # Sample all frame centres at once
+        times = window_length / 2 + np.arange(num_frames) * hop_length
+        f1s, f2s, f3s = _formant_tracks(formants, 3, times)
+
+        # Filter out NaN/undefined values and unrealistic values
+        # (NaN fails every comparison, so the range test also drops undefined frames)
+        keep = (f1s > 150) & (f1s < 1200) & (f2s > 400) & (f2s < 3500)  # Realistic formant ranges
+        f3s = np.where(np.isnan(f3s) | (f3s == 0), 2500.0, f3s)
+
+        trajectory = [
+            {'time': t, 'f1': f1, 'f2': f2, 'f3': f3}
+            for t, f1, f2, f3 in zip(
+                times[keep].tolist(), f1s[keep].tolist(), f2s[keep].tolist(), f3s[keep].tolist()
+            )
+        ]
 
         if len(trajectory) < min_frames:
             return {
@@ -662,25 +910,28 @@ def compute_dtw_distance(trajectory: list, ref_trajectory: list) -> float:
     n = len(user_f1_norm)
     m = len(ref_f1_norm)
 
-    # DTW cost matrix
-    dtw_matrix = np.full((n + 1, m + 1), np.inf)
-    dtw_matrix[0, 0] = 0
-
-    for i in range(1, n + 1):
+    # Euclidean distance in normalized F1-F2 space, all (n, m) pairs at once
+    cost = np.sqrt(
+        (user_f1_norm[:, None] - ref_f1_norm[None, :])**2 +
+        (user_f2_norm[:, None] - ref_f2_norm[None, :])**2
+    ).tolist()
+
+    # DTW accumulation is sequential; keep it on plain floats, one row at a time
+    inf = float('inf')
+    prev = [0.0] + [inf] * m
+    for i in range(n):
+        row = cost[i]
+        cur = [inf] * (m + 1)
         for j in range(1, m + 1):
-            # Euclidean distance in normalized F1-F2 space
-            cost = np.sqrt(
-                (user_f1_norm[i-1] - ref_f1_norm[j-1])**2 +
-                (user_f2_norm[i-1] - ref_f2_norm[j-1])**2
-            )
-            dtw_matrix[i, j] = cost + min(
-                dtw_matrix[i-1, j],      # insertion
-                dtw_matrix[i, j-1],      # deletion
-                dtw_matrix[i-1, j-1]     # match
+            cur[j] = row[j-1] + min(
+                prev[j],      # insertion
+                cur[j-1],     # deletion
+                prev[j-1]     # match
             )
+        prev = cur
 
     # Normalize by path length
-    dtw_distance = dtw_matrix[n, m] / (n + m)
+    dtw_distance = prev[m] / (n + m)
     return dtw_distance
 
 
@@ -871,25 +1122,27 @@ def score_diphthong_trajectory(
             'details': {}
         }
 
+    # One (n, 3) [time, f1, f2] array; the portions below are boolean masks on it
+    traj = np.array([(f['time'], f['f1'], f['f2']) for f in trajectory], dtype=np.float64)
+    times = traj[:, 0]
+
     total_duration = trajectory[-1]['time'] - trajectory[0]['time']
     t_start = trajectory[0]['time']
     t_30 = t_start + total_duration * 0.30  # First 30% boundary
     t_70 = t_start + total_duration * 0.70  # Last 30% boundary
 
-    start_portion = [f for f in trajectory if f['time'] <= t_30]
-    end_portion = [f for f in trajectory if f['time'] >= t_70]
+    start_mask = times <= t_30
+    end_mask = times >= t_70
 
     # Ensure at least one frame in each portion
-    if not start_portion:
-        start_portion = trajectory[:1]
-    if not end_portion:
-        end_portion = trajectory[-1:]
+    if not start_mask.any():
+        start_mask[0] = True
+    if not end_mask.any():
+        end_mask[-1] = True
 
     # Use MEDIAN for robustness against outliers (not mean)
-    start_f1 = np.median([f['f1'] for f in start_portion])
-    start_f2 = np.median([f['f2'] for f in start_portion])
-    end_f1 = np.median([f['f1'] for f in end_portion])
-    end_f2 = np.median([f['f2'] for f in end_portion])
+    start_f1, start_f2 = np.median(traj[start_mask, 1:], axis=0)
+    end_f1, end_f2 = np.median(traj[end_mask, 1:], axis=0)
 
     # Get reference values
     start_ref = ref_table[start_vowel_key]
@@ -1044,3 +1297,20 @@ def score_diphthong_trajectory(
             'dtw_distance': round(dtw_distance, 4),
         }
     }
+
+
+###############################################
+# 11. Process warm-up
+###############################################
+def warmup():
+    """
+    Run the vowel pipeline once on a synthetic 0.3 s tone and render both
+    plot backgrounds, so the first real request of a worker does not pay
+    for Praat's first analyses, matplotlib font loading and figure setup.
+    """
+    sr = ANALYSIS_SAMPLE_RATE
+    t = np.arange(int(0.3 * sr)) / float(sr)
+    tone = 0.3 * np.sin(2 * np.pi * 200.0 * t) + 0.1 * np.sin(2 * np.pi * 700.0 * t)
+    analyze_vowel_and_pitch(parselmouth.Sound(tone, sampling_frequency=sr))
+    for gender in ("Male", "Female"):
+        plot_single_vowel_space(500.0, 1500.0, "a (아)", gender, io.BytesIO())
@@ -29,18 +29,38 @@ Usage:
     docker compose up --build
 """
 
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
 from routes import pages_router, auth_router, analysis_router
+from analysis import vowel_v2
+
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
 # APPLICATION INITIALIZATION
 # =============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up the analysis engines once per worker before serving, so the
+    first request does not pay Praat / matplotlib cold-start costs.
+    Warm-up is best effort: a failure is logged and the app still starts.
+    """
+    try:
+        vowel_v2.warmup()
+    except Exception:
+        logger.exception("vowel_v2 warm-up failed; continuing without it")
+    yield
+
+
 app = FastAPI(
     title="KoSPA - Korean Speech Pronunciation Analyzer",
     description=(
@@ -48,7 +68,8 @@ app = FastAPI(
         "Analyzes vowel formants and consonant acoustic features "
         "to provide detailed feedback and scoring."
     ),
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
 )
 
 
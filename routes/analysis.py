@@ -15,6 +15,7 @@ pronunciation analysis with scores and feedback.
 from typing import Annotated
 
 from fastapi import APIRouter, UploadFile, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from database import (
     user_exists,
@@ -112,7 +113,8 @@ async def calibration_upload(
         vowel_key, symbol = sound_map.get(sound)
 
         # Run vowel analysis to extract formants
-        result = run_vowel_analysis(temp_audio, symbol)
+        # (CPU-bound: run on the shared worker pool, not the event loop)
+        result = await run_in_threadpool(run_vowel_analysis, temp_audio, symbol)
 
         if result.get('error'):
             raise HTTPException(